@@ -0,0 +1,165 @@
+"""Модуль асинхронных представлений для чтения.
+
+Представления повторяют ответы синхронных эндпоинтов чтения, но не
+занимают поток на время ожидания базы: работа с ORM выполняется в
+ограниченном пуле потоков, а независимые запросы (родитель, страница,
+количество) выполняются параллельно через asyncio.gather. Чтение
+доступно без токена, поэтому аутентификация не выполняется.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpResponseNotAllowed, JsonResponse
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from reviews.models import Comment, Review, Title
+
+from .filters import TitleFilter
+from .mixins import get_prefetch_plan
+from .serializers import (CommentSerializer, ReviewSerializer,
+                          TitleGETSerializer)
+from .timing import sql_timing
+from .views import TitleViewSet
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_DB_WORKERS, thread_name_prefix='async-db')
+
+
+def call_db(function, *args):
+    """Функция вызова работы с ORM в потоке пула."""
+    close_old_connections()
+    try:
+        with sql_timing():
+            return function(*args)
+    finally:
+        close_old_connections()
+
+
+async def run_db(function, *args):
+    """
+    Функция выполнения работы с ORM в пуле потоков.
+
+    Поток получает копию контекста запроса, чтобы SQL-запросы попадали
+    в таймер запроса.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        executor, partial(context.run, call_db, function, *args))
+
+
+def json_response(data, status=200):
+    """Функция построения JSON-ответа."""
+    return JsonResponse(
+        data, status=status, safe=False, encoder=DjangoJSONEncoder,
+        json_dumps_params={'ensure_ascii': False})
+
+
+def not_found():
+    """Функция построения ответа 404 в формате DRF."""
+    return json_response({'detail': 'Страница не найдена.'}, status=404)
+
+
+def async_read_view(view):
+    """Декоратор асинхронного представления, разрешающий GET и HEAD."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(('GET', 'HEAD'))
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def serialize(serializer_class, queryset):
+    """Функция сериализации выборки."""
+    return serializer_class(queryset, many=True).data
+
+
+def with_prefetch_plan(queryset, serializer_class):
+    """Функция применения плана загрузки связей сериализатора."""
+    select_related, prefetch_related = get_prefetch_plan(serializer_class)
+    return queryset.select_related(*select_related).prefetch_related(
+        *prefetch_related)
+
+
+async def paginate(request, queryset, serializer_class, *checks):
+    """
+    Функция постраничного ответа в формате PageNumberPagination.
+
+    Количество, страница и проверки родителей из `checks` запрашиваются
+    параллельно. Если какая-то проверка вернула False, ответ - 404.
+    """
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        return not_found()
+    if page < 1:
+        return not_found()
+    offset = (page - 1) * page_size
+    count, results, *found = await asyncio.gather(
+        run_db(queryset.count),
+        run_db(serialize, serializer_class,
+               queryset[offset:offset + page_size]),
+        *(run_db(check) for check in checks)
+    )
+    if not all(found) or (page > 1 and offset >= count):
+        return not_found()
+    url = request.build_absolute_uri()
+    next_url = previous_url = None
+    if offset + page_size < count:
+        next_url = replace_query_param(url, 'page', page + 1)
+    if page == 2:
+        previous_url = remove_query_param(url, 'page')
+    elif page > 2:
+        previous_url = replace_query_param(url, 'page', page - 1)
+    return json_response({
+        'count': count, 'next': next_url, 'previous': previous_url,
+        'results': results,
+    })
+
+
+@async_read_view
+async def title_list(request):
+    """Представление списка произведений с фильтрами."""
+    filterset = TitleFilter(request.GET, queryset=TitleViewSet.queryset)
+    if not filterset.is_valid():
+        return json_response(filterset.errors, status=400)
+    queryset = await run_db(lambda: filterset.qs)
+    return await paginate(request, queryset, TitleGETSerializer)
+
+
+@async_read_view
+async def title_detail(request, title_id):
+    """Представление произведения."""
+    titles = await run_db(
+        serialize, TitleGETSerializer,
+        TitleViewSet.queryset.filter(id=title_id))
+    if not titles:
+        return not_found()
+    return json_response(titles[0])
+
+
+@async_read_view
+async def review_list(request, title_id):
+    """Представление списка отзывов произведения."""
+    queryset = with_prefetch_plan(
+        Review.objects.filter(title_id=title_id), ReviewSerializer)
+    return await paginate(
+        request, queryset, ReviewSerializer,
+        Title.objects.filter(id=title_id).exists)
+
+
+@async_read_view
+async def comment_list(request, title_id, review_id):
+    """Представление списка комментариев отзыва."""
+    queryset = with_prefetch_plan(
+        Comment.objects.filter(review_id=review_id), CommentSerializer)
+    return await paginate(
+        request, queryset, CommentSerializer,
+        Review.objects.filter(id=review_id, title_id=title_id).exists)
@@ -0,0 +1,72 @@
+"""Модуль аутентификации по JWT-токену с ролью пользователя."""
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import datetime_to_epoch
+
+from users.claims import claims_changed_at, remember_claims_changed_at
+from users.models import CustomUser
+
+TOKEN_USER_CLAIMS = ('username', 'role', 'is_superuser')
+
+
+def token_issued_at(token):
+    """Функция получения времени выпуска токена доступа."""
+    if 'iat' in token:
+        return token['iat']
+    return token['exp'] - api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с именем, ролью и признаком суперпользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        """Метод выпуска токена с данными о роли пользователя."""
+        token = super().for_user(user)
+        token['iat'] = datetime_to_epoch(token.current_time)
+        for claim in TOKEN_USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        remember_claims_changed_at(user.id, (
+            user.claims_changed_at.timestamp()
+            if user.claims_changed_at else 0), replace=False)
+        return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация без обращения к базе данных.
+
+    Пользователь собирается из данных токена как экземпляр CustomUser
+    с отложенными полями: id, имя, роль и признак суперпользователя
+    доступны сразу, остальные поля загружаются из базы при обращении.
+    Токены без данных о роли и токены, выпущенные до изменения этих
+    данных, блокировки или удаления пользователя (см. users/claims.py),
+    обрабатываются загрузкой пользователя из базы, которая проверяет
+    его существование и активность.
+    """
+
+    def get_user(self, validated_token):
+        """Метод получения пользователя по проверенному токену."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя.')
+        if (any(claim not in validated_token for claim in TOKEN_USER_CLAIMS)
+                or claims_changed_at(user_id)
+                >= token_issued_at(validated_token)):
+            return super().get_user(validated_token)
+        values = {
+            api_settings.USER_ID_FIELD: user_id,
+            'is_active': True,
+            **{claim: validated_token[claim] for claim in TOKEN_USER_CLAIMS},
+        }
+        fields = [
+            field.attname for field in CustomUser._meta.concrete_fields
+            if field.attname in values
+        ]
+        return CustomUser.from_db(
+            DEFAULT_DB_ALIAS, fields, [values[name] for name in fields])
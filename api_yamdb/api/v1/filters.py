@@ -1,25 +1,83 @@
 """Модуль кастомных фильтров."""
+from django.db.models import Count
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title, TitleGenre
+from reviews.search import search_titles
+
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
+
+
+class SlugInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Фильтр по списку slug, перечисленных через запятую."""
+
+
+def clean_slugs(value):
+    """Функция получения множества непустых slug из значения фильтра."""
+    return {slug for slug in value if slug}
+
+
+def resolve_slugs(model, slugs):
+    """Функция получения id объектов по списку slug одним запросом."""
+    return list(model.objects.filter(
+        slug__in=set(slugs)).values_list('id', flat=True))
 
 
 class TitleFilter(filters.FilterSet):
     """Фильтр выборки произведений по определенным полям."""
 
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    category = SlugInFilter(method='filter_category')
+    genre = SlugInFilter(method='filter_genre')
+    genre_match = filters.ChoiceFilter(
+        choices=((MATCH_ANY, MATCH_ANY), (MATCH_ALL, MATCH_ALL)),
+        method='filter_genre_match'
     )
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='contains'
     )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+    def filter_category(self, queryset, name, value):
+        """Метод фильтрации по точному совпадению slug категорий."""
+        slugs = clean_slugs(value)
+        if not slugs:
+            return queryset
+        return queryset.filter(category_id__in=resolve_slugs(Category, slugs))
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Метод фильтрации по точному совпадению slug жанров.
+
+        Жанры проверяются подзапросом IN к TitleGenre вместо соединения,
+        поэтому произведения с несколькими жанрами не дублируются. При
+        genre_match=all произведение должно иметь все указанные жанры.
+        Список без непустых slug (`?genre=,`), как и пустой параметр, не
+        фильтрует выборку.
+        """
+        slugs = clean_slugs(value)
+        if not slugs:
+            return queryset
+        genre_ids = resolve_slugs(Genre, slugs)
+        title_genres = TitleGenre.objects.filter(genre_id__in=genre_ids)
+        if self.form.cleaned_data.get('genre_match') == MATCH_ALL:
+            if len(genre_ids) < len(slugs):
+                return queryset.none()
+            title_genres = title_genres.values('title_id').annotate(
+                genre_count=Count('genre_id', distinct=True)
+            ).filter(genre_count=len(genre_ids))
+        return queryset.filter(
+            id__in=title_genres.values('title_id').order_by())
+
+    def filter_genre_match(self, queryset, name, value):
+        """Метод-заглушка: режим учитывается при фильтрации по жанрам."""
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Метод полнотекстового поиска по названию и описанию."""
+        return search_titles(queryset, value)
@@ -0,0 +1,345 @@
+"""Модуль метрик в текстовом формате Prometheus.
+
+Middleware считает запросы и их длительность по маршрутам (для DRF -
+`TitleViewSet.list`, `UserSignupAPI.post`, для функций - имя модуля и
+функции), SQL-запросы из таймера запроса (см. timing.py) и запросы в
+обработке; кэши отмечают попадания и промахи через `cache_hit` и
+`cache_miss`. Эндпоинт /metrics отдает накопленные значения.
+
+Каждый поток пишет в свой словарь, поэтому запись идет без блокировок,
+а при выдаче словари потоков суммируются; словари завершившихся потоков
+переносятся в общую сумму процесса. Если задано
+METRICS_MULTIPROCESS_DIR, каждый процесс не реже раза в
+METRICS_FLUSH_INTERVAL секунд сохраняет свои значения в файл этого
+каталога, а /metrics суммирует файлы всех процессов; gauge учитываются
+только для живых процессов.
+"""
+import asyncio
+import atexit
+import glob
+import json
+import os
+import threading
+from bisect import bisect_left
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+from .timing import request_timer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Имя метрики: тип и описание.
+METRICS = {
+    'yamdb_http_requests_total': (
+        'counter', 'Количество обработанных HTTP-запросов.'),
+    'yamdb_http_request_duration_seconds': (
+        'histogram', 'Длительность обработки HTTP-запросов.'),
+    'yamdb_http_requests_in_progress': (
+        'gauge', 'Количество HTTP-запросов в обработке.'),
+    'yamdb_db_queries_total': (
+        'counter', 'Количество SQL-запросов при обработке HTTP-запросов.'),
+    'yamdb_db_query_duration_seconds_total': (
+        'counter', 'Суммарное время SQL-запросов.'),
+    'yamdb_cache_hits_total': ('counter', 'Количество попаданий в кэш.'),
+    'yamdb_cache_misses_total': ('counter', 'Количество промахов кэша.'),
+}
+
+
+class MetricsRegistry:
+    """
+    Хранилище метрик процесса.
+
+    Ключ значения - пара (имя метрики, кортеж пар меток). Значение
+    счетчика и gauge - число, гистограммы - список количеств наблюдений
+    по интервалам LATENCY_BUCKETS и выше последней границы, за которым
+    следует сумма наблюдений.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        # Пары (поток, словарь значений) живых потоков и сумма значений
+        # завершившихся потоков.
+        self.shards = []
+        self.retired = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.flushed_at = monotonic()
+
+    def shard(self):
+        """Метод получения словаря значений текущего потока."""
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard = self.local.shard = {}
+            with self.lock:
+                self.retire_dead_threads()
+                self.shards.append((threading.current_thread(), shard))
+            return shard
+
+    def retire_dead_threads(self):
+        """
+        Метод переноса значений завершившихся потоков в общую сумму.
+
+        Вызывается под self.lock при регистрации потока и при выдаче
+        значений, поэтому словарей не больше, чем живых потоков.
+        """
+        alive = []
+        for thread, shard in self.shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                merge(self.retired, shard.items())
+        self.shards = alive
+
+    def inc(self, name, labels, value=1):
+        """Метод увеличения счетчика или gauge."""
+        shard = self.shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        """Метод добавления наблюдения в гистограмму."""
+        shard = self.shard()
+        key = (name, labels)
+        buckets = shard.get(key)
+        if buckets is None:
+            buckets = shard[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+        buckets[bisect_left(LATENCY_BUCKETS, value)] += 1
+        buckets[-1] += value
+
+    def snapshot(self):
+        """Метод получения суммы значений всех потоков."""
+        with self.lock:
+            self.retire_dead_threads()
+            merged = {}
+            merge(merged, self.retired.items())
+            for _, shard in self.shards:
+                merge(merged, shard.copy().items())
+        return merged
+
+    def clear(self):
+        """Метод сброса значений всех потоков."""
+        with self.lock:
+            self.retired.clear()
+            for _, shard in self.shards:
+                shard.clear()
+
+    def path(self, pid=None):
+        """Метод получения файла значений процесса."""
+        return os.path.join(
+            settings.METRICS_MULTIPROCESS_DIR,
+            f'metrics-{pid or os.getpid()}.json')
+
+    def flush(self, blocking=True):
+        """Метод сохранения значений процесса в общий каталог."""
+        if not settings.METRICS_MULTIPROCESS_DIR:
+            return
+        # Без ожидания, если файл уже сохраняет другой поток.
+        if not self.flush_lock.acquire(blocking=blocking):
+            return
+        try:
+            path = self.path()
+            temporary = f'{path}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as output:
+                json.dump([
+                    [name, labels, value]
+                    for (name, labels), value in self.snapshot().items()
+                ], output)
+            os.replace(temporary, path)
+            self.flushed_at = monotonic()
+        finally:
+            self.flush_lock.release()
+
+    def flush_if_due(self):
+        """Метод сохранения значений, если прошел интервал сохранения."""
+        if (settings.METRICS_MULTIPROCESS_DIR
+                and monotonic() - self.flushed_at
+                >= settings.METRICS_FLUSH_INTERVAL):
+            self.flush(blocking=False)
+
+    def collect(self):
+        """Метод получения значений процесса или всех процессов."""
+        if not settings.METRICS_MULTIPROCESS_DIR:
+            return self.snapshot()
+        self.flush()
+        merged = {}
+        for path in glob.glob(self.path('*')):
+            try:
+                with open(path, encoding='utf-8') as source:
+                    rows = json.load(source)
+            except (OSError, ValueError):
+                continue
+            alive = process_alive(int(
+                os.path.basename(path)[len('metrics-'):-len('.json')]))
+            merge(merged, (
+                ((name, tuple(map(tuple, labels))), value)
+                for name, labels, value in rows
+                if alive or METRICS[name][0] != 'gauge'))
+        return merged
+
+
+def merge(merged, items):
+    """Функция суммирования значений в словарь merged."""
+    for key, value in items:
+        if isinstance(value, list):
+            total = merged.get(key)
+            merged[key] = list(value) if total is None else [
+                left + right for left, right in zip(total, value)]
+        else:
+            merged[key] = merged.get(key, 0) + value
+
+
+def process_alive(pid):
+    """Функция проверки, что процесс с данным pid существует."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
+
+
+def cache_hit(name):
+    """Функция учета попадания в кэш name."""
+    registry.inc('yamdb_cache_hits_total', (('cache', name),))
+
+
+def cache_miss(name):
+    """Функция учета промаха кэша name."""
+    registry.inc('yamdb_cache_misses_total', (('cache', name),))
+
+
+def route_name(request):
+    """
+    Функция получения метки маршрута запроса.
+
+    Для представлений DRF это класс и действие, для функций - модуль и
+    имя функции, для неизвестных адресов - `unmatched`, чтобы число
+    меток не зависело от запрашиваемых адресов.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    view = match.func
+    view_class = getattr(view, 'cls', None) or getattr(
+        view, 'view_class', None)
+    if view_class is None:
+        return f'{view.__module__.rsplit(".", 1)[-1]}.{view.__name__}'
+    method = request.method.lower()
+    action = (getattr(view, 'actions', None) or {}).get(method, method)
+    return f'{view_class.__name__}.{action}'
+
+
+def format_labels(labels):
+    """Функция форматирования меток в синтаксисе Prometheus."""
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"')
+         .replace('\n', r'\n'))
+        for name, value in labels)
+    return '{' + ','.join(
+        f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_histogram(name, labels, buckets):
+    """Функция форматирования гистограммы в строки Prometheus."""
+    lines, count = [], 0
+    bounds = [*map(repr, LATENCY_BUCKETS), '+Inf']
+    for bound, observations in zip(bounds, buckets):
+        count += observations
+        lines.append(
+            f'{name}_bucket{format_labels(labels + (("le", bound),))} '
+            f'{count}')
+    lines.append(f'{name}_sum{format_labels(labels)} {buckets[-1]}')
+    lines.append(f'{name}_count{format_labels(labels)} {count}')
+    return lines
+
+
+def render_metrics(values):
+    """Функция форматирования значений в текстовый формат Prometheus."""
+    lines = []
+    for name, (kind, description) in METRICS.items():
+        series = sorted(
+            (labels, value) for (metric, labels), value in values.items()
+            if metric == name)
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series:
+            if kind == 'histogram':
+                lines.extend(format_histogram(name, labels, value))
+            else:
+                lines.append(f'{name}{format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """Функция выдачи метрик в текстовом формате Prometheus."""
+    return HttpResponse(
+        render_metrics(registry.collect()), content_type=CONTENT_TYPE)
+
+
+def record(request, response, timer, started):
+    """Функция учета завершенного запроса."""
+    route = route_name(request)
+    registry.inc('yamdb_http_requests_total', (
+        ('method', request.method), ('route', route),
+        ('status', str(response.status_code))))
+    labels = (('method', request.method), ('route', route))
+    registry.observe(
+        'yamdb_http_request_duration_seconds', labels,
+        perf_counter() - started)
+    registry.inc('yamdb_db_queries_total', labels, timer.queries)
+    registry.inc(
+        'yamdb_db_query_duration_seconds_total', labels, timer.query_time)
+    registry.flush_if_due()
+    return response
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Middleware учета запросов в метриках.
+
+    SQL-запросы берутся из таймера запроса, поэтому в MIDDLEWARE стоит
+    после server_timing_middleware и использует его таймер.
+    """
+    if not settings.METRICS_ENABLED:
+        return get_response
+
+    in_progress = ('yamdb_http_requests_in_progress', ())
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            started = perf_counter()
+            registry.inc(*in_progress)
+            try:
+                with request_timer(sql=False) as timer:
+                    response = await get_response(request)
+            finally:
+                registry.inc(*in_progress, -1)
+            return record(request, response, timer, started)
+    else:
+        def middleware(request):
+            started = perf_counter()
+            registry.inc(*in_progress)
+            try:
+                with request_timer() as timer:
+                    response = get_response(request)
+            finally:
+                registry.inc(*in_progress, -1)
+            return record(request, response, timer, started)
+
+    return middleware
@@ -1,12 +1,32 @@
 """Модуль кастомных миксинов."""
+import hashlib
+from functools import lru_cache
+
 from rest_framework import mixins, viewsets
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import ManyRelatedField, RelatedField
 from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from reviews.replicas import replica_is_fresh, replica_routing, use_replica
+from reviews.versions import get_last_modified, get_versions
 
+from .metrics import cache_hit, cache_miss
 from .permissions import IsAdminOnly
+from .timing import measure
+
+# Заголовки, при которых ответ может быть дан без обработчика (304, 412).
+CONDITIONAL_HEADERS = frozenset((
+    'HTTP_IF_MATCH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE',
+    'HTTP_IF_UNMODIFIED_SINCE'))
 
 
 class ListCreateDestroyViewSet(
@@ -33,3 +53,261 @@ class DeleteBySlugMixin:
         obj = get_object_or_404(model, slug=slug)
         obj.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CachedListMixin:
+    """
+    Кастомный миксин кэширования ответов на чтение каталога.
+
+    Ключ строится из пути с параметрами запроса и версий моделей из
+    `cache_models`, поэтому любое изменение этих моделей делает
+    закэшированные ответы недостижимыми. Разрешения проверяются до
+    обращения к кэшу.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        """Метод получения списка объектов через кэш."""
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Метод получения ответа из кэша или его вычисления."""
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            cache_hit('response')
+            return Response(data)
+        cache_miss('response')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
+    def get_response_cache_key(self, request):
+        """Метод построения ключа кэша по адресу и версиям моделей."""
+        versions = ':'.join(map(str, get_versions(*self.cache_models)))
+        digest = hashlib.md5(
+            request.build_absolute_uri().encode('utf-8')).hexdigest()
+        return f'response:{digest}:{versions}'
+
+
+class CachedResponseMixin(CachedListMixin):
+    """Кастомный миксин кэширования списка и отдельных объектов."""
+
+    def retrieve(self, request, *args, **kwargs):
+        """Метод получения объекта через кэш."""
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Кастомный миксин условных GET-запросов.
+
+    ETag и Last-Modified вычисляются по версиям моделей из
+    `get_validator_models` без сериализации, при совпадении
+    If-None-Match или If-Modified-Since возвращается 304. Ответ 304
+    дается только существующему ресурсу: объект загружается до проверки
+    валидаторов условного запроса, а вложенные маршруты проверяют
+    родителя в `get_validator_models`.
+    """
+
+    def get_validator_models(self):
+        """Метод получения моделей, от которых зависит ответ."""
+        return self.cache_models
+
+    def get_object(self):
+        """Метод получения объекта один раз за запрос."""
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def list(self, request, *args, **kwargs):
+        """Метод получения списка объектов с условным ответом."""
+        return self.conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Метод получения существующего объекта с условным ответом."""
+        if CONDITIONAL_HEADERS & request.META.keys():
+            self.get_object()
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Метод получения ответа 304 или полного ответа с валидаторами."""
+        models = self.get_validator_models()
+        versions = ':'.join(map(str, get_versions(*models)))
+        etag = '"{}"'.format(hashlib.md5(
+            f'{request.get_full_path()}:{versions}'.encode('utf-8')
+        ).hexdigest())
+        last_modified = int(get_last_modified(*models))
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class NestedParentMixin:
+    """
+    Кастомный миксин получения родителя вложенного маршрута.
+
+    Родитель загружается один раз за запрос одним запросом, который
+    проверяет всю цепочку идентификаторов из URL, и передается
+    сериализатору в контексте под ключом `parent`.
+    """
+
+    parent_model = None
+    parent_lookups = {}
+    parent_related = ()
+
+    def get_parent(self):
+        """Метод получения родительского объекта из URL."""
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model.objects.select_related(
+                    *self.parent_related),
+                **{field: self.kwargs.get(kwarg)
+                   for field, kwarg in self.parent_lookups.items()}
+            )
+        return self._parent
+
+    def get_serializer_context(self):
+        """Метод добавления родителя в контекст сериализатора."""
+        context = super().get_serializer_context()
+        context['parent'] = self.get_parent()
+        return context
+
+
+@lru_cache(maxsize=None)
+def get_prefetch_plan(serializer_class):
+    """
+    Функция построения плана загрузки связей по полям сериализатора.
+
+    Связи, для представления которых нужен связанный объект, а не только
+    его pk, попадают в select_related, множественные связи и вложенные
+    сериализаторы с many=True — в prefetch_related.
+    """
+    select_related, prefetch_related = [], []
+    for field in serializer_class().fields.values():
+        if field.source == '*':
+            continue
+        lookup = field.source.replace('.', '__')
+        if isinstance(field, ManyRelatedField) or (
+                isinstance(field, BaseSerializer)
+                and getattr(field, 'many', False)):
+            prefetch_related.append(lookup)
+        elif isinstance(field, BaseSerializer) or (
+                isinstance(field, RelatedField)
+                and not field.use_pk_only_optimization()):
+            select_related.append(lookup)
+    return tuple(select_related), tuple(prefetch_related)
+
+
+class PrefetchPlanMixin:
+    """
+    Кастомный миксин загрузки связей, нужных сериализатору.
+
+    План по умолчанию строится по связанным полям сериализатора, его
+    можно объявить явно парой (select_related, prefetch_related) в
+    `prefetch_plan`.
+    """
+
+    prefetch_plan = None
+
+    def get_prefetch_plan(self):
+        """Метод получения плана загрузки связей."""
+        if self.prefetch_plan is not None:
+            return self.prefetch_plan
+        return get_prefetch_plan(self.get_serializer_class())
+
+    def apply_prefetch_plan(self, queryset):
+        """Метод применения плана загрузки связей к выборке."""
+        select_related, prefetch_related = self.get_prefetch_plan()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class ReplicaReadMixin:
+    """
+    Кастомный миксин чтения безопасных запросов из реплик.
+
+    Запросы GET, HEAD и OPTIONS читают из реплики, если модели из
+    `replica_models` (по умолчанию `cache_models`) не менялись за время
+    отставания реплик. Остальные запросы и запросы, успевшие что-то
+    записать, работают с основной базой.
+    """
+
+    replica_models = None
+
+    def get_replica_models(self):
+        """Метод получения моделей, от свежести которых зависит ответ."""
+        if self.replica_models is not None:
+            return self.replica_models
+        return self.cache_models
+
+    def dispatch(self, request, *args, **kwargs):
+        """Метод обработки запроса в области маршрутизации чтений."""
+        with replica_routing():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        """Метод выбора реплики после аутентификации и проверки прав."""
+        super().initial(request, *args, **kwargs)
+        if (request.method in SAFE_METHODS
+                and replica_is_fresh(*self.get_replica_models())):
+            use_replica()
+
+
+class ServerTimingMixin:
+    """
+    Кастомный миксин замера этапов обработки запроса.
+
+    Отмечает на таймере запроса (см. timing.py) аутентификацию,
+    проверку разрешений, загрузку объектов выборки и рендеринг ответа,
+    который для этого выполняется сразу. Сериализацию замеряют сами
+    сериализаторы (см. `TimedModelSerializer`).
+    """
+
+    def perform_authentication(self, request):
+        """Метод аутентификации с замером времени."""
+        with measure('auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        """Метод проверки разрешений с замером времени."""
+        with measure('perm'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        """Метод проверки разрешений на объект с замером времени."""
+        with measure('perm'):
+            super().check_object_permissions(request, obj)
+
+    def get_object(self):
+        """Метод получения объекта с замером времени."""
+        with measure('query'):
+            return super().get_object()
+
+    def paginate_queryset(self, queryset):
+        """Метод получения страницы выборки с замером времени."""
+        with measure('query'):
+            return super().paginate_queryset(queryset)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Метод подготовки ответа с замером рендеринга."""
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        if isinstance(response, Response) and not response.is_rendered:
+            with measure('render'):
+                response.render()
+        return response
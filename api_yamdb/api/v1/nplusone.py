@@ -0,0 +1,83 @@
+"""Модуль обнаружения N+1 запросов.
+
+Один и тот же SQL-запрос, выполненный много раз с разными параметрами
+за один HTTP-запрос, почти всегда означает загрузку связанных объектов
+по одному. В режиме отладки middleware предупреждает о таких запросах
+в логе или, если включено N_PLUS_ONE_RAISE, падает с ошибкой.
+"""
+import asyncio
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+
+class NPlusOneError(Exception):
+    """Исключение при обнаружении N+1 запросов."""
+
+
+class NPlusOneDetector:
+    """Контекстный менеджер подсчета повторов одинаковых SQL-запросов."""
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        self.queries = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries[sql] += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    @property
+    def repeated(self):
+        """Свойство со списком запросов, повторенных не меньше порога."""
+        return [
+            (sql, count) for sql, count in self.queries.most_common()
+            if count >= self.threshold
+        ]
+
+    def check(self):
+        """Метод проверки, вызывающий NPlusOneError при повторах."""
+        if self.repeated:
+            sql, count = self.repeated[0]
+            raise NPlusOneError(
+                f'Запрос выполнен {count} раз за один запрос: {sql}')
+
+
+@sync_and_async_middleware
+def n_plus_one_middleware(get_response):
+    """
+    Middleware обнаружения N+1 запросов в режиме отладки.
+
+    В асинхронной цепочке (ASGI) middleware ничего не делает: запросы к
+    базе там выполняются в пуле потоков, и счетчик текущего потока их не
+    видит, а синхронная обертка занимала бы поток на каждый запрос.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        return get_response
+
+    def middleware(request):
+        if not settings.DEBUG:
+            return get_response(request)
+        with NPlusOneDetector() as detector:
+            response = get_response(request)
+        if settings.N_PLUS_ONE_RAISE:
+            detector.check()
+        for sql, count in detector.repeated:
+            logger.warning(
+                'N+1: %s %s, запрос выполнен %s раз: %s',
+                request.method, request.path, count, sql)
+        return response
+
+    return middleware
@@ -0,0 +1,40 @@
+"""Модуль кастомных пагинаторов."""
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Пагинатор по ключу сортировки без COUNT(*) и OFFSET.
+
+    Порядок берется из атрибута `cursor_ordering` представления.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        """Метод получения порядка сортировки из представления."""
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """
+    Постраничный пагинатор с включаемым курсорным режимом.
+
+    Если в запросе передан параметр `cursor` (в том числе пустой),
+    выборка листается по курсору, иначе - по номеру страницы.
+    """
+
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Метод выбора режима пагинации по параметрам запроса."""
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = KeysetCursorPagination()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view)
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Метод формирования ответа выбранного режима пагинации."""
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
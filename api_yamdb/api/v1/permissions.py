@@ -1,7 +1,7 @@
 """Модуль пользовательских разрешений."""
 from rest_framework import permissions
 
-from users.models import CustomUser
+from .roles import get_role_info, is_admin
 
 
 class IsAdminOnly(permissions.BasePermission):
@@ -13,10 +13,7 @@ class IsAdminOnly(permissions.BasePermission):
 
         Является ли пользователь админом или суперпользователем.
         """
-        return request.user.is_authenticated and (
-            CustomUser.objects.get(id=request.user.id).role == 'admin' or (
-                CustomUser.objects.get(id=request.user.id).is_superuser == 1)
-        )
+        return request.user.is_authenticated and is_admin(request)
 
 
 class IsModerator(permissions.BasePermission):
@@ -25,7 +22,7 @@ class IsModerator(permissions.BasePermission):
     def has_permission(self, request, view):
         """Метод проверки является ли пользователь модератором."""
         return request.user.is_authenticated and (
-            CustomUser.objects.get(id=request.user.id).role == 'moderator'
+            get_role_info(request).role == 'moderator'
         )
 
 
@@ -35,9 +32,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         """Метод проверки является ли пользователь админом или супером."""
         if request.user.id:
-            return CustomUser.objects.get(
-                id=request.user.id).role == 'admin' or (
-                CustomUser.objects.get(id=request.user.id).is_superuser == 1)
+            return is_admin(request)
         return request.method in permissions.SAFE_METHODS
 
 
@@ -48,6 +43,5 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         """Метод проверки является ли пользователь автором."""
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user or (
-                request.user.role == 'moderator' or (
-                    request.user.role == 'admin')))
+            or obj.author_id == request.user.id
+            or get_role_info(request).role in ('moderator', 'admin'))
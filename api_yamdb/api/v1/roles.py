@@ -0,0 +1,35 @@
+"""Модуль определения роли пользователя для проверки разрешений."""
+from collections import namedtuple
+
+RoleInfo = namedtuple('RoleInfo', ('role', 'is_superuser'))
+
+ANONYMOUS_ROLE = RoleInfo(role=None, is_superuser=False)
+
+
+def get_role_info(request):
+    """
+    Функция получения роли и признака суперпользователя.
+
+    Значение вычисляется один раз за запрос по пользователю, которого
+    загрузила аутентификация, без обращения к базе данных. Данные о роли
+    в выпущенных токенах отзываются моделью пользователя при ее
+    сохранении (см. users/claims.py).
+    """
+    role_info = getattr(request, '_role_info', None)
+    if role_info is None:
+        role_info = _resolve_role_info(request.user)
+        request._role_info = role_info
+    return role_info
+
+
+def is_admin(request):
+    """Функция проверки, является ли пользователь админом или супером."""
+    role_info = get_role_info(request)
+    return role_info.role == 'admin' or role_info.is_superuser
+
+
+def _resolve_role_info(user):
+    """Функция определения роли аутентифицированного пользователя."""
+    if not user or not user.is_authenticated:
+        return ANONYMOUS_ROLE
+    return RoleInfo(role=user.role, is_superuser=bool(user.is_superuser))
@@ -1,33 +1,86 @@
 """Модуль сериализаторов проекта."""
-from django.shortcuts import get_object_or_404
+from operator import attrgetter
+
+from django.db import IntegrityError
+from django.utils.encoding import smart_str
 
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.registry import get_by_id, get_by_slug, get_registry
 from users.models import ROLE_CHOICES, CustomUser
 
+from .timing import measure
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """Сериализатор списка с замером сериализации."""
+
+    @property
+    def data(self):
+        """Метод получения данных списка с замером времени."""
+        with measure('serialize'):
+            return super().data
+
+
+class TimedModelSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор модели с замером сериализации.
+
+    Время получения `data` отмечается на таймере запроса как этап
+    serialize (см. timing.py). Сериализаторы, которые отдают списки,
+    указывают в Meta `list_serializer_class = TimedListSerializer`.
+    """
 
-class GenreSerializer(serializers.ModelSerializer):
+    @property
+    def data(self):
+        """Метод получения данных с замером времени."""
+        with measure('serialize'):
+            return super().data
+
+
+class GenreSerializer(TimedModelSerializer):
     """Сериализатор для модели жанров."""
 
     class Meta:
         model = Genre
         fields = ('name', 'slug')
+        list_serializer_class = TimedListSerializer
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedModelSerializer):
     """Сериализатор для модели категорий."""
 
     class Meta:
         model = Category
         fields = ('name', 'slug')
+        list_serializer_class = TimedListSerializer
+
+
+class RegistrySlugRelatedField(serializers.SlugRelatedField):
+    """Поле slug жанра или категории с поиском в локальном реестре."""
+
+    def to_internal_value(self, data):
+        """Метод получения объекта по slug без запроса к базе."""
+        obj = get_by_slug(self.get_queryset().model, smart_str(data))
+        if obj is None:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(data))
+        return obj
+
 
+class TitleGETSerializer(TimedModelSerializer):
+    """
+    Сериализатор для модели произведений при GET-запросе.
 
-class TitleGETSerializer(serializers.ModelSerializer):
-    """Сериализатор для модели произведений при GET-запросе."""
+    Жанры и категория берутся из локального реестра по id, поэтому
+    для страницы произведений нужны только связи из TitleGenre.
+    """
 
-    genre = GenreSerializer(many=True, required=False)
-    category = CategorySerializer()
+    genre = serializers.SerializerMethodField()
+    category = serializers.SerializerMethodField()
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -35,15 +88,43 @@ class TitleGETSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'name', 'year', 'rating', 'description', 'genre', 'category')
         read_only_fields = fields
-
-
-class TitleSerializer(serializers.ModelSerializer):
+        list_serializer_class = TimedListSerializer
+
+    def from_registry(self, model, obj_id):
+        """Метод получения объекта из реестра, загруженного на запрос."""
+        registries = self.__dict__.setdefault('_registries', {})
+        if model not in registries:
+            registries[model] = get_registry(model)
+        return registries[model].by_id.get(obj_id) or get_by_id(model, obj_id)
+
+    def get_genre(self, title):
+        """Метод получения жанров произведения."""
+        genres = filter(None, (
+            self.from_registry(Genre, title_genre.genre_id)
+            for title_genre in title.titlegenre_set.all()
+        ))
+        # to_representation вместо data: сериализация уже замеряется
+        # сериализатором произведений.
+        return GenreSerializer(many=True).to_representation(
+            sorted(genres, key=attrgetter('name')))
+
+    def get_category(self, title):
+        """Метод получения категории произведения."""
+        if title.category_id is None:
+            return None
+        category = self.from_registry(Category, title.category_id)
+        return (
+            CategorySerializer().to_representation(category)
+            if category else None)
+
+
+class TitleSerializer(TimedModelSerializer):
     """Сериализатор для модели произведений при небезопасном запросе."""
 
-    genre = serializers.SlugRelatedField(
+    genre = RegistrySlugRelatedField(
         slug_field='slug', queryset=Genre.objects.all(),
         many=True, required=False)
-    category = serializers.SlugRelatedField(
+    category = RegistrySlugRelatedField(
         slug_field='slug', queryset=Category.objects.all())
 
     class Meta:
@@ -51,8 +132,67 @@ class TitleSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'name', 'year', 'description', 'genre', 'category')
 
+    def validate(self, attrs):
+        """
+        Метод проверки жанров и категории из реестра по базе.
+
+        Реестр процесса может хранить объект, уже удаленный в другом
+        процессе, поэтому перед записью существование объектов
+        проверяется одним запросом на модель.
+        """
+        for field_name, model in (('genre', Genre), ('category', Category)):
+            objs = attrs.get(field_name) or ()
+            if isinstance(objs, model):
+                objs = (objs,)
+            if not objs:
+                continue
+            existing = set(model.objects.filter(
+                id__in=[obj.id for obj in objs]).values_list('id', flat=True))
+            missing = [obj for obj in objs if obj.id not in existing]
+            if missing:
+                get_registry(model, reload=True)
+                raise serializers.ValidationError({field_name: [
+                    RegistrySlugRelatedField.default_error_messages[
+                        'does_not_exist'].format(
+                        slug_name='slug', value=missing[0].slug)]})
+        return attrs
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор произведения при массовой загрузке.
+
+    Slug жанров и категорий проверяются по словарям, загруженным один
+    раз на весь пакет и переданным в контексте.
+    """
+
+    genre = serializers.ListField(
+        child=serializers.SlugField(), default=list)
+    category = serializers.SlugField()
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'genre', 'category')
+
+    def validate_genre(self, value):
+        """Метод получения жанров по slug."""
+        genres = self.context['genres']
+        unknown = [slug for slug in value if slug not in genres]
+        if unknown:
+            raise serializers.ValidationError(
+                f'Жанры не найдены: {", ".join(unknown)}.')
+        return list({slug: genres[slug] for slug in value}.values())
 
-class UserSignUpSerializer(serializers.ModelSerializer):
+    def validate_category(self, value):
+        """Метод получения категории по slug."""
+        category = self.context['categories'].get(value)
+        if category is None:
+            raise serializers.ValidationError(
+                f'Категория {value} не найдена.')
+        return category
+
+
+class UserSignUpSerializer(TimedModelSerializer):
     """Класс сериализатора для регистрации пользователя."""
 
     class Meta:
@@ -80,7 +220,7 @@ class UserSignUpSerializer(serializers.ModelSerializer):
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedModelSerializer):
     """Класс сериализатора для пользователя."""
 
     role = serializers.ChoiceField(
@@ -99,7 +239,7 @@ class UserSerializer(serializers.ModelSerializer):
                   'first_name', 'last_name', 'bio', 'role',)
 
 
-class AdminSerializer(serializers.ModelSerializer):
+class AdminSerializer(TimedModelSerializer):
     """Класс сериализатора для админа."""
 
     role = serializers.ChoiceField(
@@ -120,9 +260,10 @@ class AdminSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = ('username', 'email', 'is_staff', 'password',
                   'first_name', 'last_name', 'bio', 'role',)
+        list_serializer_class = TimedListSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedModelSerializer):
     """Класс сериализатора для комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -134,9 +275,10 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         fields = '__all__'
         model = Comment
+        list_serializer_class = TimedListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedModelSerializer):
     """Класс сериализатора для отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -154,22 +296,26 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return value
 
-    def validate(self, value):
-        """Метод для для проверки существования отзыва."""
-        author = self.context['request'].user
-        title_id = (self.context['request'].
-                    parser_context['kwargs'].get('title_id'))
-        title = get_object_or_404(
-            Title,
-            id=title_id
-        )
-        if (self.context['request'].method == 'POST'
-                and title.reviews.filter(author=author).exists()):
-            raise serializers.ValidationError(
-                f'Отзыв на произведение {title.name} уже существует'
-            )
-        return value
+    def create(self, validated_data):
+        """
+        Метод создания отзыва с проверкой уникальности на уровне базы.
+
+        Отзыв сразу вставляется, а повтор распознается по ошибке
+        ограничения unique_author_title, что исключает лишний запрос и
+        гонку между параллельными запросами одного автора.
+        """
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            title = validated_data['title']
+            if title.reviews.filter(author=validated_data['author']).exists():
+                raise serializers.ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        f'Отзыв на произведение {title.name} уже существует']
+                })
+            raise
 
     class Meta:
         fields = '__all__'
         model = Review
+        list_serializer_class = TimedListSerializer
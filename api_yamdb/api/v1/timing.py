@@ -0,0 +1,159 @@
+"""Модуль замера времени обработки запросов.
+
+Middleware заводит на каждый запрос таймер, а представления отмечают на
+нем этапы: аутентификацию (auth), проверку разрешений (perm), загрузку
+объектов из выборки (query), сериализацию (serialize) и рендеринг
+ответа (render). Время этапа не включает вложенные этапы и SQL-запросы,
+которые учитываются отдельно (db) вместе с их количеством. Результат
+отдается заголовком Server-Timing и, если включено SERVER_TIMING_LOG,
+строкой JSON в лог.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connection
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+_current_timer = ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    """Таймер этапов и SQL-запросов одного HTTP-запроса."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.phases = defaultdict(float)
+        self.queries = 0
+        self.query_time = 0.0
+        # Время, уже отнесенное к этапам или SQL: этап вычитает из своей
+        # длительности то, что было учтено внутри него.
+        self.accounted = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - started
+            with self.lock:
+                self.queries += 1
+                self.query_time += elapsed
+                self.accounted += elapsed
+
+    @contextmanager
+    def phase(self, name):
+        """Контекстный менеджер замера этапа без вложенных этапов и SQL."""
+        started = perf_counter()
+        accounted = self.accounted
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - started
+            with self.lock:
+                own = max(elapsed - (self.accounted - accounted), 0.0)
+                self.phases[name] += own
+                self.accounted += own
+
+    def metrics(self):
+        """Метод получения метрик в миллисекундах."""
+        metrics = {name: value * 1000 for name, value in self.phases.items()}
+        metrics['db'] = self.query_time * 1000
+        metrics['total'] = (perf_counter() - self.started) * 1000
+        return metrics
+
+    def header(self, metrics):
+        """Метод построения значения заголовка Server-Timing."""
+        return ', '.join(
+            f'{name};dur={value:.3f}'
+            + (f';desc="{self.queries} queries"' if name == 'db' else '')
+            for name, value in metrics.items())
+
+
+def measure(name):
+    """Функция замера этапа текущего запроса, если таймер запущен."""
+    timer = _current_timer.get()
+    if timer is None:
+        return nullcontext()
+    return timer.phase(name)
+
+
+def sql_timing():
+    """Функция учета SQL-запросов текущего потока в таймере запроса."""
+    timer = _current_timer.get()
+    if timer is None:
+        return nullcontext()
+    return connection.execute_wrapper(timer)
+
+
+def finish(timer, request, response):
+    """Функция записи результатов замера в ответ и в лог."""
+    metrics = timer.metrics()
+    response['Server-Timing'] = timer.header(metrics)
+    if settings.SERVER_TIMING_LOG:
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timer.queries,
+            **{f'{name}_ms': round(value, 3)
+               for name, value in metrics.items()},
+        }))
+    return response
+
+
+@contextmanager
+def request_timer(sql=True):
+    """
+    Контекстный менеджер таймера текущего запроса.
+
+    Если таймер уже запущен внешним middleware, возвращает его, иначе
+    запускает новый; при sql=True SQL-запросы текущего потока
+    учитываются в таймере.
+    """
+    timer = _current_timer.get()
+    if timer is not None:
+        yield timer
+        return
+    timer = RequestTimer()
+    token = _current_timer.set(timer)
+    try:
+        with connection.execute_wrapper(timer) if sql else nullcontext():
+            yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@sync_and_async_middleware
+def server_timing_middleware(get_response):
+    """
+    Middleware замера времени обработки запроса.
+
+    Стоит первым в MIDDLEWARE, чтобы total включал остальные middleware.
+    В асинхронной цепочке SQL-запросы учитываются в потоках пула
+    асинхронных представлений (см. `sql_timing`).
+    """
+    if not settings.SERVER_TIMING:
+        return get_response
+
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            with request_timer(sql=False) as timer:
+                response = await get_response(request)
+            return finish(timer, request, response)
+    else:
+        def middleware(request):
+            with request_timer() as timer:
+                response = get_response(request)
+            return finish(timer, request, response)
+
+    return middleware
@@ -2,6 +2,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (AdminCreateList, AdminDetail, CategoryViewSet,
                     CommentViewSet, GenreViewSet, ReviewViewSet, TitleViewSet,
                     UserObtainTokenAPI, UserRetrieveUpdateAPI, UserSignupAPI)
@@ -27,5 +28,18 @@ urlpatterns = [
     path('users/me/', UserRetrieveUpdateAPI.as_view(), name='update_user'),
     path('users/', AdminCreateList.as_view(), name='admin_create_user_list'),
     path('users/<username>/', AdminDetail.as_view(), name='user_detail'),
+    path('async/titles/', async_views.title_list, name='async_titles'),
+    path(
+        'async/titles/<int:title_id>/', async_views.title_detail,
+        name='async_title_detail'
+    ),
+    path(
+        'async/titles/<int:title_id>/reviews/', async_views.review_list,
+        name='async_reviews'
+    ),
+    path(
+        'async/titles/<int:title_id>/reviews/<int:review_id>/comments/',
+        async_views.comment_list, name='async_comments'
+    ),
     path('', include(router.urls)),
 ]
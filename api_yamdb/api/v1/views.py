@@ -1,33 +1,46 @@
 """Модуль преставлений приложения."""
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Max, Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import filters, generics, status, views, viewsets
+from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
-from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre)
+from reviews.versions import bump_version
 from users.models import CustomUser
+from users.outbox import enqueue_email
 
+from .authentication import RoleAccessToken
 from .filters import TitleFilter
-from .mixins import ListCreateDestroyViewSet, DeleteBySlugMixin
+from .mixins import (CachedListMixin, CachedResponseMixin,
+                     ConditionalGetMixin, DeleteBySlugMixin,
+                     ListCreateDestroyViewSet, NestedParentMixin,
+                     PrefetchPlanMixin, ReplicaReadMixin,
+                     ServerTimingMixin)
+from .pagination import OptionalCursorPagination
+from .parsers import NDJSONParser
 from .permissions import IsAdminOnly, IsAdminOrReadOnly, IsOwnerOrReadOnly
 from .serializers import (AdminSerializer, CategorySerializer,
                           CommentSerializer, GenreSerializer,
-                          ReviewSerializer, TitleGETSerializer,
-                          TitleSerializer, UserSerializer,
+                          ReviewSerializer, TitleBulkSerializer,
+                          TitleGETSerializer, TitleSerializer, UserSerializer,
                           UserSignUpSerializer)
 
 
-class UserSignupAPI(views.APIView):
+class UserSignupAPI(ServerTimingMixin, views.APIView):
     """Класс для регистрации пользователя и отправки кода подтверждения."""
 
     permission_classes = (AllowAny,)
@@ -38,14 +51,13 @@ class UserSignupAPI(views.APIView):
             get_object_or_404(
                 CustomUser, username=request.data['username']
             ))
-        send_mail(
+        enqueue_email(
             subject='Регистрация пользователя',
             message=('Для получения токена перейдите по адресу'
                      '/api/v1/auth/token/ и введите код подтверждения'
                      f' confirmation_code: {confirmation_code}'),
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[f'{request.data["email"]}'],
-            fail_silently=True,
         )
 
     def post(self, request):
@@ -68,7 +80,7 @@ class UserSignupAPI(views.APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserObtainTokenAPI(views.APIView):
+class UserObtainTokenAPI(ServerTimingMixin, views.APIView):
     """Класс для отправки токена пользователю."""
 
     permission_classes = (AllowAny,)
@@ -80,16 +92,16 @@ class UserObtainTokenAPI(views.APIView):
         user = get_object_or_404(
             CustomUser, username=request.data.get('username')
         )
-        if default_token_generator.check_token(
+        if user.is_active and default_token_generator.check_token(
                 user, request.data['confirmation_code']):
-            token = AccessToken.for_user(user)
+            token = RoleAccessToken.for_user(user)
             return Response({'token': f'{token}'}, status=status.HTTP_200_OK)
         return Response(
             ['Неверный код подтверждения.'], status=status.HTTP_400_BAD_REQUEST
         )
 
 
-class UserRetrieveUpdateAPI(views.APIView):
+class UserRetrieveUpdateAPI(ServerTimingMixin, views.APIView):
     """Класс для обновления профиля пользователем."""
 
     permission_classes = (IsAuthenticated,)
@@ -110,7 +122,7 @@ class UserRetrieveUpdateAPI(views.APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AdminCreateList(generics.ListCreateAPIView):
+class AdminCreateList(ServerTimingMixin, generics.ListCreateAPIView):
     """Класс создания пользователя и получения списка пользователей админом."""
 
     queryset = CustomUser.objects.all()
@@ -121,7 +133,8 @@ class AdminCreateList(generics.ListCreateAPIView):
     pagination_class = PageNumberPagination
 
 
-class AdminDetail(generics.RetrieveUpdateDestroyAPIView):
+class AdminDetail(
+        ServerTimingMixin, generics.RetrieveUpdateDestroyAPIView):
     """Класс получения/обновления/удаления профиля пользователя админом."""
 
     queryset = CustomUser.objects.all()
@@ -132,9 +145,11 @@ class AdminDetail(generics.RetrieveUpdateDestroyAPIView):
 
 
 class GenreViewSet(
+        ServerTimingMixin, ReplicaReadMixin, CachedListMixin,
         ListCreateDestroyViewSet, DeleteBySlugMixin):
     """Обработчик объектов модели жанров"""
 
+    cache_models = (Genre,)
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
@@ -143,9 +158,11 @@ class GenreViewSet(
 
 
 class CategoryViewSet(
+        ServerTimingMixin, ReplicaReadMixin, CachedListMixin,
         ListCreateDestroyViewSet, DeleteBySlugMixin):
     """Обработчик объектов модели категорий"""
 
+    cache_models = (Category,)
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
@@ -153,74 +170,185 @@ class CategoryViewSet(
     search_fields = ('name',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+        ServerTimingMixin, ReplicaReadMixin, ConditionalGetMixin,
+        CachedResponseMixin, viewsets.ModelViewSet):
     """Обработчик объектов модели произведений."""
 
-    queryset = Title.objects.select_related('category').prefetch_related(
-        'genre').annotate(rating=Avg('reviews__score')).order_by('id')
+    cache_models = (Category, Genre, Review, Title, TitleGenre)
+    queryset = Title.objects.prefetch_related(Prefetch(
+        'titlegenre_set', queryset=TitleGenre.objects.only('title', 'genre')
+    )).order_by('id')
     serializer_class = TitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('id',)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     http_method_names = ('get', 'post', 'patch', 'delete',)
 
+    bulk_max_items = 10000
+
     def get_serializer_class(self):
         """Метод выбора сериализатора."""
         if self.action in ['list', 'retrieve']:
             return TitleGETSerializer
         return TitleSerializer
 
+    @action(
+        detail=False, methods=['post'], url_path='bulk',
+        permission_classes=(IsAdminOnly,),
+        parser_classes=(JSONParser, NDJSONParser))
+    def bulk(self, request):
+        """
+        Метод массовой загрузки произведений.
+
+        Принимает JSON-массив или NDJSON, создает все корректные
+        произведения в одной транзакции и возвращает результат по каждому
+        элементу в порядке загрузки.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается список произведений.')
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                f'За один запрос можно загрузить не более '
+                f'{self.bulk_max_items} произведений.')
+        context = self.get_bulk_context(items)
+        results, valid = [], []
+        for index, item in enumerate(items):
+            serializer = TitleBulkSerializer(data=item, context=context)
+            if serializer.is_valid():
+                result = {'index': index, 'status': status.HTTP_201_CREATED}
+                valid.append((result, serializer.validated_data))
+            else:
+                result = {
+                    'index': index, 'status': status.HTTP_400_BAD_REQUEST,
+                    'errors': serializer.errors,
+                }
+            results.append(result)
+        self.save_bulk_titles(valid)
+        created = len(valid)
+        if created == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            'created': created, 'failed': len(items) - created,
+            'results': results,
+        }, status=response_status)
+
+    def get_bulk_context(self, items):
+        """Метод загрузки жанров и категорий пакета по одному запросу."""
+        genre_slugs, category_slugs = set(), set()
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            genres = item.get('genre')
+            if isinstance(genres, list):
+                genre_slugs.update(
+                    slug for slug in genres if isinstance(slug, str))
+            if isinstance(item.get('category'), str):
+                category_slugs.add(item['category'])
+        return {
+            'genres': Genre.objects.in_bulk(genre_slugs, field_name='slug'),
+            'categories': Category.objects.in_bulk(
+                category_slugs, field_name='slug'),
+        }
+
+    def save_bulk_titles(self, valid):
+        """
+        Метод вставки произведений и их жанров через bulk_create.
+
+        Если база не возвращает id вставленных строк (SQLite в Django 3.2),
+        они восстанавливаются по максимальному id: в транзакции после
+        первой вставки запись в таблицу заблокирована, поэтому id пакета
+        идут подряд.
+        """
+        if not valid:
+            return
+        titles = [
+            Title(
+                name=data['name'], year=data['year'],
+                description=data.get('description'),
+                category=data['category'])
+            for _, data in valid
+        ]
+        with transaction.atomic():
+            Title.objects.bulk_create(titles)
+            if titles[0].id is None:
+                last_id = Title.objects.aggregate(last_id=Max('id'))['last_id']
+                for title_id, title in enumerate(
+                        titles, last_id - len(titles) + 1):
+                    title.id = title_id
+            TitleGenre.objects.bulk_create(
+                TitleGenre(title_id=title.id, genre_id=genre.id)
+                for title, (_, data) in zip(titles, valid)
+                for genre in data['genre']
+            )
+            transaction.on_commit(partial(bump_version, Title, TitleGenre))
+        for title, (result, _) in zip(titles, valid):
+            result['id'] = title.id
+
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+        ServerTimingMixin, ReplicaReadMixin, NestedParentMixin,
+        PrefetchPlanMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """Обработчик объектов модели комментариев."""
 
     permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly,)
     serializer_class = CommentSerializer
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-pub_date', '-id')
     http_method_names = ('get', 'post', 'patch', 'delete',)
+    parent_model = Review
+    parent_lookups = {'id': 'review_id', 'title_id': 'title_id'}
+    parent_related = ('title',)
+    replica_models = (Comment, CustomUser, Review, Title)
+
+    def get_validator_models(self):
+        """Метод получения версии комментариев существующего отзыва."""
+        return ((Comment, self.get_parent().id),)
 
     def get_queryset(self):
         """Метод получения комментариев к ревью."""
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id')
-        )
-        return review.comments.all()
+        return self.apply_prefetch_plan(self.get_parent().comments.all())
 
     def perform_create(self, serializer):
         """Метод сохранения автора."""
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id')
-        )
         serializer.save(
             author=self.request.user,
-            review=review
+            review=self.get_parent()
         )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+        ServerTimingMixin, ReplicaReadMixin, NestedParentMixin,
+        PrefetchPlanMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """Обработчик объектов модели отзывов."""
 
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly)
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-pub_date', '-id')
     http_method_names = ('get', 'post', 'patch', 'delete',)
+    parent_model = Title
+    parent_lookups = {'id': 'title_id'}
+    replica_models = (CustomUser, Review, Title)
+
+    def get_validator_models(self):
+        """Метод получения версии отзывов существующего произведения."""
+        return ((Review, self.get_parent().id),)
 
     def get_queryset(self):
         """Метод получения ревью к произведению."""
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
-        )
-        return title.reviews.all()
+        return self.apply_prefetch_plan(self.get_parent().reviews.all())
 
     def perform_create(self, serializer):
         """Метод сохранения автора."""
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
-        )
         serializer.save(
             author=self.request.user,
-            title=title
+            title=self.get_parent()
         )
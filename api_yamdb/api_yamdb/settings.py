@@ -28,6 +28,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.v1.timing.server_timing_middleware',
+    'api.v1.metrics.metrics_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -35,6 +37,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.v1.nplusone.n_plus_one_middleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -65,9 +68,51 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
     }
 }
 
+# PRAGMA, выполняемые при открытии каждого соединения с SQLite
+# (см. reviews/sqlite.py). Пустой словарь оставляет настройки SQLite
+# по умолчанию.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+# Реплики основной базы: псевдонимы из DATABASES, из которых читают
+# безопасные запросы к каталогу (см. reviews/replicas.py). Реплики
+# наполняются репликацией основной базы, миграции к ним не применяются.
+DATABASE_REPLICAS = []
+
+# Наибольшее отставание реплик в секундах: модели, менявшиеся за это
+# время, читаются из основной базы.
+REPLICA_LAG_SECONDS = 5
+
+DATABASE_ROUTERS = ['reviews.replicas.ReplicaRouter']
+
+
+# Cache
+# Версии моделей для инвалидации ответов и отметки об отзыве данных в
+# токенах хранятся в этом же кэше, поэтому при нескольких процессах нужен
+# общий бэкенд (файловый, Redis, Memcached).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Предельный возраст реестра жанров и категорий процесса в секундах (см.
+# reviews/registry.py): с кэшем процесса это задержка, с которой
+# изменения каталога из других процессов видны при чтении.
+CATALOG_REGISTRY_MAX_AGE = 60
+
 
 # Password validation
 
@@ -94,17 +139,51 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 DEFAULT_FROM_EMAIL = 'api_yamdb@example.com'
 
+# Очередь исходящей почты: режим отправки (thread, worker или eager),
+# размер пачки, число попыток, базовая задержка повтора и время аренды
+# пачки обработчиком в секундах.
+EMAIL_OUTBOX_DISPATCH = 'thread'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_LEASE = 300
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
+# Срок кэширования времени изменения данных токена пользователя (см.
+# users/claims.py): с кэшем процесса это предельная задержка отзыва
+# токенов в остальных процессах.
+TOKEN_CLAIMS_CACHE_TIMEOUT = 60
+
+# Размер пула потоков для работы с базой в асинхронных представлениях.
+ASYNC_DB_WORKERS = 8
+
+# Обнаружение N+1 запросов при DEBUG: порог повторов одного SQL-запроса
+# и падение с ошибкой вместо предупреждения в логе.
+N_PLUS_ONE_THRESHOLD = 5
+N_PLUS_ONE_RAISE = False
+
+# Заголовок Server-Timing с этапами обработки запроса и строка JSON с
+# теми же замерами в лог api.v1.timing.
+SERVER_TIMING = True
+SERVER_TIMING_LOG = False
+
+# Метрики Prometheus на /metrics. Для нескольких процессов-обработчиков
+# задайте общий каталог: процессы сохраняют в него значения не реже раза
+# в METRICS_FLUSH_INTERVAL секунд, а /metrics их суммирует.
+METRICS_ENABLED = True
+METRICS_MULTIPROCESS_DIR = None
+METRICS_FLUSH_INTERVAL = 5
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -7,3 +7,7 @@ class ReviewsConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        """Метод подключения обработчиков сигналов."""
+        from . import signals, sqlite  # noqa: F401
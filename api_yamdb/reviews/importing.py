@@ -0,0 +1,144 @@
+"""Модуль разбора CSV файлов для команды import_data.
+
+Функции модуля не обращаются к моделям и базе данных, поэтому могут
+выполняться в отдельных процессах пула.
+"""
+import csv
+from itertools import islice
+
+from django.utils.dateparse import parse_datetime
+
+
+class OffsetLineReader:
+    """Итератор строк бинарного файла с подсчетом смещения в байтах"""
+
+    def __init__(self, file):
+        self.file = file
+        self.offset = file.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+    def seek(self, offset):
+        self.file.seek(offset)
+        self.offset = offset
+
+
+def read_chunks(file_name, chunk_size, offset=0):
+    """Чтение CSV файла пачками строк начиная со смещения в байтах.
+
+    Возвращает пачки в виде пар (список строк-словарей, смещение конца
+    пачки), поэтому в памяти одновременно находится только одна пачка.
+    """
+    with open(file_name, mode='rb') as csvfile:
+        lines = OffsetLineReader(csvfile)
+        header = next(csv.reader(lines))
+        if offset > lines.offset:
+            lines.seek(offset)
+        csv_reader = csv.reader(lines)
+        while True:
+            rows = [
+                dict(zip(header, values))
+                for values in islice(csv_reader, chunk_size)]
+            if not rows:
+                break
+            yield rows, lines.offset
+
+
+def read_header(file_name):
+    """Чтение заголовка CSV файла"""
+    with open(file_name, mode='r', encoding='utf-8', newline='') as csvfile:
+        return next(csv.reader(csvfile))
+
+
+def parse_rows(parse_function, rows):
+    """Разбор пачки строк в значения полей моделей.
+
+    Возвращает пары (строка, значения полей) и пары (строка, ошибка)
+    для строк, которые не удалось разобрать.
+    """
+    parsed, rejected = [], []
+    for row in rows:
+        try:
+            parsed.append((row, parse_function(row)))
+        except (KeyError, TypeError, ValueError) as error:
+            rejected.append((row, f'некорректные данные: {error}'))
+    return parsed, rejected
+
+
+def parse_pub_date(value):
+    """Разбор даты публикации"""
+    pub_date = parse_datetime(value)
+    if pub_date is None:
+        raise ValueError(f'некорректная дата {value!r}')
+    return pub_date
+
+
+def parse_slug_object(row):
+    """Разбор строки жанра или категории"""
+    return {'id': int(row['id']), 'name': row['name'], 'slug': row['slug']}
+
+
+def parse_title(row):
+    """Разбор строки произведения"""
+    return {
+        'id': int(row['id']),
+        'name': row['name'],
+        'year': int(row['year']),
+        'category_id': int(row['category']),
+    }
+
+
+def parse_title_genre(row):
+    """Разбор строки связи произведения и жанра"""
+    return {
+        'id': int(row['id']),
+        'genre_id': int(row['genre_id']),
+        'title_id': int(row['title_id']),
+    }
+
+
+def parse_user(row):
+    """Разбор строки пользователя"""
+    return {
+        'id': int(row['id']),
+        'username': row['username'],
+        'email': row['email'],
+        'role': row['role'],
+        'bio': row['bio'],
+        'first_name': row['first_name'],
+        'last_name': row['last_name'],
+    }
+
+
+def parse_review(row):
+    """Разбор строки отзыва"""
+    score = int(row['score'])
+    if not 1 <= score <= 10:
+        raise ValueError(f'оценка {score} вне диапазона от 1 до 10')
+    return {
+        'id': int(row['id']),
+        'title_id': int(row['title_id']),
+        'text': row['text'],
+        'author_id': int(row['author']),
+        'score': score,
+        'pub_date': parse_pub_date(row['pub_date']),
+    }
+
+
+def parse_comment(row):
+    """Разбор строки комментария"""
+    return {
+        'id': int(row['id']),
+        'review_id': int(row['review_id']),
+        'text': row['text'],
+        'author_id': int(row['author']),
+        'pub_date': parse_pub_date(row['pub_date']),
+    }
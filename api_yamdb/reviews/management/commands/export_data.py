@@ -0,0 +1,121 @@
+import csv
+import json
+import os
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from reviews.models import Genre, Category, Title, TitleGenre, Review, Comment
+from users.models import CustomUser
+
+CHUNK_SIZE = 2000
+
+# Файл, модель, столбцы в формате import_data и соответствующие им поля.
+EXPORT_FILES = (
+    ('genre', Genre, ('id', 'name', 'slug'), ('id', 'name', 'slug')),
+    ('category', Category, ('id', 'name', 'slug'), ('id', 'name', 'slug')),
+    ('titles', Title, ('id', 'name', 'year', 'category'),
+     ('id', 'name', 'year', 'category_id')),
+    ('genre_title', TitleGenre, ('id', 'title_id', 'genre_id'),
+     ('id', 'title_id', 'genre_id')),
+    ('users', CustomUser,
+     ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'),
+     ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name')),
+    ('review', Review,
+     ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+     ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date')),
+    ('comments', Comment,
+     ('id', 'review_id', 'text', 'author', 'pub_date'),
+     ('id', 'review_id', 'text', 'author_id', 'pub_date')),
+)
+
+
+def serialize_value(value):
+    """Преобразование даты в ISO 8601, остальные значения без изменений"""
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+class Command(BaseCommand):
+    """Команда для потоковой выгрузки данных моделей в CSV или JSONL
+    файлы в формате, который читает import_data"""
+
+    help = 'Выгружает данные в CSV или JSONL файлы в формате import_data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='export',
+            help='Директория для выгружаемых файлов.'
+        )
+        parser.add_argument(
+            '--format', choices=('csv', 'jsonl'), default='csv',
+            help='Формат файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--since',
+            help=('Выгрузить только отзывы и комментарии, опубликованные '
+                  'начиная с указанной даты или даты и времени (ISO 8601).')
+        )
+        parser.add_argument(
+            '--since-id', type=int,
+            help='Выгрузить только объекты с id больше указанного.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        since = self.parse_since(options['since'])
+        os.makedirs(options['path'], exist_ok=True)
+        write_function = getattr(self, f'write_{options["format"]}')
+        for file_name, model, columns, fields in EXPORT_FILES:
+            queryset = model.objects.order_by('id')
+            if options['since_id'] is not None:
+                queryset = queryset.filter(id__gt=options['since_id'])
+            if since is not None and 'pub_date' in fields:
+                queryset = queryset.filter(pub_date__gte=since)
+            rows = queryset.values_list(*fields).iterator(
+                chunk_size=options['chunk_size'])
+            path = os.path.join(
+                options['path'], f'{file_name}.{options["format"]}')
+            count = write_function(path, columns, rows)
+            self.stdout.write(f'{path}: выгружено {count}')
+        self.stdout.write(self.style.SUCCESS('Выгрузка данных завершена.'))
+
+    def parse_since(self, value):
+        """Разбор даты или даты и времени начала инкрементальной выгрузки"""
+        if value is None:
+            return None
+        since = parse_datetime(value)
+        if since is None:
+            since_date = parse_date(value)
+            if since_date is None:
+                raise CommandError(f'Некорректная дата в --since: {value}')
+            since = datetime.combine(since_date, time.min)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def write_csv(self, path, columns, rows):
+        """Построчная запись CSV файла"""
+        count = 0
+        with open(path, mode='w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(serialize_value(value) for value in row)
+                count += 1
+        return count
+
+    def write_jsonl(self, path, columns, rows):
+        """Построчная запись JSONL файла"""
+        count = 0
+        with open(path, mode='w', encoding='utf-8') as file:
+            for row in rows:
+                file.write(json.dumps(
+                    dict(zip(columns, row)), ensure_ascii=False,
+                    default=serialize_value))
+                file.write('\n')
+                count += 1
+        return count
@@ -0,0 +1,218 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre)
+from reviews.versions import bump_version
+from users.models import CustomUser
+
+CHUNK_SIZE = 20000
+
+START_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+WORDS = (
+    'время', 'город', 'дорога', 'жизнь', 'звезда', 'история', 'книга',
+    'лето', 'любовь', 'мир', 'море', 'ночь', 'огонь', 'песня', 'память',
+    'путь', 'река', 'свет', 'сердце', 'сказка', 'солнце', 'тайна', 'тень',
+    'утро', 'ветер', 'война', 'дом', 'зима', 'небо', 'сон', 'снег', 'дождь',
+    'отличный', 'скучный', 'сильный', 'странный', 'добрый', 'долгий',
+    'новый', 'старый', 'живой', 'тихий', 'яркий', 'последний', 'главный',
+)
+
+# Поля, заполняемые генератором, в порядке значений строк.
+FIELDS = {
+    Category: ('id', 'name', 'slug'),
+    Genre: ('id', 'name', 'slug'),
+    CustomUser: (
+        'id', 'password', 'is_superuser', 'username', 'first_name',
+        'last_name', 'email', 'is_staff', 'is_active', 'date_joined', 'bio',
+        'role'),
+    Title: (
+        'id', 'name', 'year', 'description', 'category', 'rating',
+        'score_sum', 'review_count'),
+    TitleGenre: ('title', 'genre'),
+    Review: ('id', 'author', 'title', 'text', 'score', 'pub_date'),
+    Comment: ('id', 'author', 'review', 'text', 'pub_date'),
+}
+
+
+def spread(total, parts, index):
+    """Размер части index при равномерном делении total на parts частей"""
+    return (index + 1) * total // parts - index * total // parts
+
+
+def insert_rows(cursor, model, rows):
+    """Вставка строк в таблицу модели одним executemany без объектов"""
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    columns = ', '.join(
+        quote(model._meta.get_field(name).column) for name in FIELDS[model])
+    placeholders = ', '.join(['%s'] * len(FIELDS[model]))
+    cursor.executemany(
+        f'INSERT INTO {quote(model._meta.db_table)} ({columns}) '
+        f'VALUES ({placeholders})', rows)
+
+
+class Command(BaseCommand):
+    """Команда генерации синтетического набора данных заданного
+    размера для нагрузочного тестирования.
+
+    Один и тот же --seed дает один и тот же набор данных. Строки
+    вставляются напрямую через executemany пачками по --chunk-size
+    строк в транзакции, рейтинги произведений считаются при генерации,
+    поэтому пересчет после генерации не нужен."""
+
+    help = ('Генерирует воспроизводимый набор пользователей, жанров, '
+            'категорий, произведений, отзывов и комментариев.')
+
+    def add_arguments(self, parser):
+        for name, default in (('users', 1000), ('genres', 20),
+                              ('categories', 5), ('titles', 10000),
+                              ('reviews', 100000), ('comments', 100000)):
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help=f'Количество объектов: {name}.')
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора случайных чисел.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Количество строк, вставляемых в одной транзакции.')
+
+    def handle(self, *args, **options):
+        self.check_options(options)
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.rows = {model: [] for model in FIELDS}
+        self.counts = dict.fromkeys(FIELDS, 0)
+        self.review_id = self.comment_id = 0
+        self.adapt_datetime = connection.ops.adapt_datetimefield_value
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            self.cursor = cursor
+            self.generate_catalog()
+            for index in range(options['users']):
+                self.rows[CustomUser].append(self.user_row(index + 1))
+                self.flush_if_full()
+            for index in range(options['titles']):
+                self.generate_title(index)
+                self.flush_if_full()
+            self.flush()
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), list(FIELDS)):
+                cursor.execute(sql)
+        bump_version(*FIELDS)
+        elapsed = time.perf_counter() - started
+        total = sum(self.counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Сгенерировано строк: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с).'))
+
+    def check_options(self, options):
+        """Проверка, что набор можно сгенерировать в текущую базу"""
+        if any(options[name] < 0 for name in (
+                'users', 'genres', 'categories', 'titles', 'reviews',
+                'comments')) or options['chunk_size'] < 1:
+            raise CommandError('Размеры должны быть неотрицательными.')
+        if options['reviews'] and (
+                -(-options['reviews'] // max(options['titles'], 1))
+                > options['users']):
+            raise CommandError(
+                'Каждый пользователь оставляет не больше одного отзыва на '
+                'произведение: увеличьте --users или --titles.')
+        if options['comments'] and not (
+                options['reviews'] and options['users']):
+            raise CommandError('Для комментариев нужны отзывы.')
+        non_empty = [
+            model._meta.verbose_name_plural for model in FIELDS
+            if model.objects.exists()]
+        if non_empty:
+            raise CommandError(
+                f'База данных не пуста ({", ".join(map(str, non_empty))}): '
+                f'выполните python manage.py flush.')
+
+    def generate_catalog(self):
+        """Генерация категорий и жанров"""
+        for model, name, count in (
+                (Category, 'category', self.options['categories']),
+                (Genre, 'genre', self.options['genres'])):
+            self.rows[model].extend(
+                (pk, f'{model._meta.verbose_name.capitalize()} {pk}',
+                 f'{name}-{pk}')
+                for pk in range(1, count + 1))
+
+    def user_row(self, user_id):
+        """Строка пользователя с неиспользуемым паролем"""
+        return (
+            user_id, '!', False, f'user{user_id}', '', '',
+            f'user{user_id}@yamdb.fake', False, True,
+            self.adapt_datetime(START_DATE), '', 'user')
+
+    def generate_title(self, index):
+        """Генерация произведения вместе с жанрами, отзывами и
+        комментариями к отзывам"""
+        rng = self.rng
+        title_id = index + 1
+        scores = [
+            rng.randint(1, 10) for _ in range(spread(
+                self.options['reviews'], self.options['titles'], index))]
+        categories = self.options['categories']
+        self.rows[Title].append((
+            title_id, self.text(rng.randint(1, 3)).capitalize(),
+            rng.randint(1900, 2024), self.text(12),
+            rng.randint(1, categories) if categories else None,
+            sum(scores) / len(scores) if scores else None,
+            sum(scores), len(scores)))
+        genres = self.options['genres']
+        for genre_id in rng.sample(
+                range(1, genres + 1), min(rng.randint(1, 3), genres)):
+            self.rows[TitleGenre].append((title_id, genre_id))
+        first_author = rng.randrange(self.options['users'] or 1)
+        for number, score in enumerate(scores):
+            self.generate_review(
+                title_id, (first_author + number) % self.options['users'] + 1,
+                score)
+
+    def generate_review(self, title_id, author_id, score):
+        """Генерация отзыва и комментариев к нему"""
+        rng = self.rng
+        self.review_id += 1
+        pub_date = START_DATE + timedelta(seconds=10 * self.review_id)
+        self.rows[Review].append((
+            self.review_id, author_id, title_id, self.text(20), score,
+            self.adapt_datetime(pub_date)))
+        for number in range(spread(
+                self.options['comments'], self.options['reviews'],
+                self.review_id - 1)):
+            self.comment_id += 1
+            self.rows[Comment].append((
+                self.comment_id, rng.randrange(self.options['users']) + 1,
+                self.review_id, self.text(8),
+                self.adapt_datetime(pub_date + timedelta(minutes=number + 1))))
+
+    def text(self, words):
+        """Случайный текст из заданного количества слов"""
+        return ' '.join(self.rng.choices(WORDS, k=words))
+
+    def flush_if_full(self):
+        """Запись накопленных строк, если набралась пачка"""
+        if sum(map(len, self.rows.values())) >= self.options['chunk_size']:
+            self.flush()
+
+    def flush(self):
+        """Запись накопленных строк одной транзакцией в порядке
+        зависимостей моделей"""
+        with transaction.atomic():
+            for model, rows in self.rows.items():
+                insert_rows(self.cursor, model, rows)
+                self.counts[model] += len(rows)
+                rows.clear()
+        self.stdout.write(', '.join(
+            f'{model._meta.verbose_name_plural}: {count}'
+            for model, count in self.counts.items()))
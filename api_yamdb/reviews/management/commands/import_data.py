@@ -1,27 +1,132 @@
 import csv
 import os
+from collections import deque
+from itertools import islice
+from concurrent.futures import (FIRST_COMPLETED, Future,
+                                ProcessPoolExecutor, wait)
+
 from django.core.management.base import BaseCommand
-from reviews.models import Genre, Category, Title, TitleGenre, Review, Comment
+from django.db import IntegrityError, transaction
+from reviews.importing import (parse_comment, parse_review, parse_rows,
+                               parse_slug_object, parse_title,
+                               parse_title_genre, parse_user, read_chunks,
+                               read_header)
+from reviews.models import (Genre, Category, Title, TitleGenre, Review,
+                            Comment, ImportCheckpoint)
+from reviews.signals import recompute_title_ratings
+from reviews.versions import bump_version
 from users.models import CustomUser
 
+DATA_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), '../../../static/data')
+
+CHUNK_SIZE = 5000
+
+# Поле, по значениям которого у модели ведутся версии областей.
+VERSION_SCOPES = {Review: 'title_id', Comment: 'review_id'}
+
+# Файл, модель, функция разбора строки и внешние ключи (поле, модель).
+IMPORT_FILES = (
+    ('genre.csv', Genre, parse_slug_object, ()),
+    ('category.csv', Category, parse_slug_object, ()),
+    ('titles.csv', Title, parse_title, (('category_id', Category),)),
+    ('genre_title.csv', TitleGenre, parse_title_genre,
+     (('genre_id', Genre), ('title_id', Title))),
+    ('users.csv', CustomUser, parse_user, ()),
+    ('review.csv', Review, parse_review,
+     (('title_id', Title), ('author_id', CustomUser))),
+    ('comments.csv', Comment, parse_comment,
+     (('review_id', Review), ('author_id', CustomUser))),
+)
+
+
+def build_dependencies(import_files):
+    """Граф зависимостей файлов по внешним ключам их моделей"""
+    producers = {model: file_name for file_name, model, *_ in import_files}
+    return {
+        file_name: {
+            producers[related_model] for _, related_model in foreign_keys
+            if related_model in producers
+        }
+        for file_name, _, _, foreign_keys in import_files
+    }
+
+
+def topological_order(dependencies):
+    """Порядок файлов, в котором каждый идет после своих зависимостей"""
+    order, done = [], set()
+    while len(order) < len(dependencies):
+        ready = [
+            file_name for file_name, required in dependencies.items()
+            if file_name not in done and required <= done]
+        if not ready:
+            raise ValueError('Циклическая зависимость между файлами.')
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+
+class InlineExecutor:
+    """Исполнитель, выполняющий задачи сразу в текущем процессе"""
+
+    def submit(self, function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
 
 class Command(BaseCommand):
     """Команда для импорта данных из CSV файлов по указанной
     директории в определённые модели"""
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=DATA_DIRECTORY,
+            help='Директория с CSV файлами.'
+        )
+        parser.add_argument(
+            '--bulk', action='store_true',
+            help='Пакетный импорт через bulk_create по пачкам строк.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Количество строк в одной пачке пакетного импорта.'
+        )
+        parser.add_argument(
+            '--stream', action='store_true',
+            help=('Потоковый импорт с контрольными точками и записью '
+                  'отклоненных строк в отдельные файлы.')
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить потоковый импорт с последней контрольной точки.'
+        )
+        parser.add_argument(
+            '--rejects-dir',
+            help=('Директория для файлов отклоненных строк '
+                  '(по умолчанию директория с CSV файлами).')
+        )
+        parser.add_argument(
+            '--workers', type=int, default=0,
+            help=('Количество процессов для разбора CSV файлов; '
+                  'включает пакетный режим, если не выбран потоковый.')
+        )
+
+    def handle(self, *args, **options):
         try:
-            directory = os.path.join(
-                os.path.dirname(__file__), '../../../static/data')
-            os.chdir(directory)
-
-            self.import_data('genre.csv', self.import_genre)
-            self.import_data('category.csv', self.import_category)
-            self.import_data('titles.csv', self.import_title)
-            self.import_data('genre_title.csv', self.import_title_genre)
-            self.import_data('users.csv', self.import_user)
-            self.import_data('review.csv', self.import_review)
-            self.import_data('comments.csv', self.import_comment)
+            os.chdir(options['path'])
+
+            self.chunk_size = options['chunk_size']
+            self.known_ids = {}
+            self.stream = options['stream'] or options['resume']
+            self.rejects_dir = options['rejects_dir'] or os.getcwd()
+            if self.stream or options['bulk'] or options['workers']:
+                self.chunked_import_all(options['resume'], options['workers'])
+            else:
+                self.import_all()
 
             self.stdout.write(
                 self.style.SUCCESS('Импорт данных из CSV файлов завершен.'))
@@ -30,6 +135,233 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f'Произошла ошибка при импорте данных: {e}'))
 
+    def import_all(self):
+        """Построчный импорт всех CSV файлов"""
+        self.import_data('genre.csv', self.import_genre)
+        self.import_data('category.csv', self.import_category)
+        self.import_data('titles.csv', self.import_title)
+        self.import_data('genre_title.csv', self.import_title_genre)
+        self.import_data('users.csv', self.import_user)
+        self.import_data('review.csv', self.import_review)
+        self.import_data('comments.csv', self.import_comment)
+
+    def chunked_import_all(self, resume, workers):
+        """Пакетный или потоковый импорт всех CSV файлов.
+
+        Пачки разбираются в пуле из workers процессов, а единственный
+        писатель в текущем процессе сохраняет их в порядке зависимостей:
+        пачка файла применяется, только когда все файлы, на которые он
+        ссылается, полностью записаны. Независимые файлы (users.csv)
+        записываются по мере готовности."""
+        if self.stream and not resume:
+            ImportCheckpoint.objects.all().delete()
+            self.remove_rejected()
+        specs = {spec[0]: spec for spec in IMPORT_FILES}
+        dependencies = build_dependencies(IMPORT_FILES)
+        order = topological_order(dependencies)
+        self.progress = {file_name: [0, 0] for file_name in order}
+        executor = (
+            ProcessPoolExecutor(max_workers=workers) if workers > 1
+            else InlineExecutor())
+        try:
+            self.run_scheduler(
+                executor, max(workers, 1) * 2, order, specs, dependencies)
+        finally:
+            executor.shutdown(wait=True)
+            bump_version(*(model for _, model, _, _ in IMPORT_FILES))
+
+    def run_scheduler(self, executor, max_pending, order, specs,
+                      dependencies):
+        """Цикл чтения, параллельного разбора и записи пачек"""
+        chunks = self.iter_chunks(order, specs)
+        queues = {file_name: deque() for file_name in order}
+        read_files, written_files = set(), set()
+        while len(written_files) < len(order):
+            pending = sum(len(queue) for queue in queues.values())
+            for file_name, rows, offset in islice(
+                    chunks, max(max_pending - pending, 0)):
+                if rows is None:
+                    read_files.add(file_name)
+                else:
+                    queues[file_name].append((executor.submit(
+                        parse_rows, specs[file_name][2], rows), offset))
+            if not self.write_ready_chunks(
+                    order, specs, dependencies, queues, read_files,
+                    written_files):
+                running = [
+                    future for queue in queues.values()
+                    for future, _ in queue if not future.done()]
+                if running:
+                    wait(running, return_when=FIRST_COMPLETED)
+
+    def write_ready_chunks(self, order, specs, dependencies, queues,
+                           read_files, written_files):
+        """Запись разобранных пачек файлов, чьи зависимости уже записаны"""
+        progress = False
+        for file_name in order:
+            if not dependencies[file_name] <= written_files:
+                continue
+            queue = queues[file_name]
+            while queue and queue[0][0].done():
+                future, offset = queue.popleft()
+                self.write_chunk(specs[file_name], *future.result(), offset)
+                progress = True
+            if (file_name in read_files and not queue
+                    and file_name not in written_files):
+                written_files.add(file_name)
+                progress = True
+        return progress
+
+    def iter_chunks(self, order, specs):
+        """Последовательное чтение пачек всех файлов в порядке зависимостей.
+
+        После последней пачки файла возвращается отметка без строк."""
+        for file_name in order:
+            offset = 0
+            if self.stream:
+                checkpoint = ImportCheckpoint.objects.filter(
+                    file_name=file_name).first()
+                if checkpoint:
+                    offset = checkpoint.offset
+                    self.stdout.write(
+                        f'{file_name}: продолжение с байта {offset}')
+            for rows, end_offset in read_chunks(
+                    file_name, self.chunk_size, offset):
+                yield file_name, rows, end_offset
+            yield file_name, None, None
+
+    def write_chunk(self, spec, parsed, rejected, offset):
+        """Запись разобранной пачки одной транзакцией.
+
+        В пакетном режиме внешние ключи проверяются по множествам
+        идентификаторов, загруженным один раз, строки с ошибками
+        пропускаются. В потоковом режиме идентификаторы проверяются
+        запросами по пачке, вместе с пачкой сохраняется контрольная
+        точка, а строки с ошибками записываются в файл отклоненных строк.
+        Рейтинги произведений из пачки отзывов пересчитываются в той же
+        транзакции, поэтому прерванный импорт не оставляет расхождений."""
+        file_name, model, _, foreign_keys = spec
+        if self.stream:
+            self.load_chunk_ids(parsed, model, foreign_keys)
+        objs, missing = self.build_chunk(parsed, model, foreign_keys)
+        rejected += missing
+        with transaction.atomic():
+            if self.stream:
+                failed = self.insert_chunk(model, objs)
+                ImportCheckpoint.objects.update_or_create(
+                    file_name=file_name,
+                    defaults={
+                        'offset': offset,
+                        'last_id': max(
+                            (obj.id for obj, _ in objs), default=None),
+                    }
+                )
+            else:
+                model.objects.bulk_create(
+                    (obj for obj, _ in objs), batch_size=500)
+                failed = []
+            if model is Review:
+                recompute_title_ratings({obj.title_id for obj, _ in objs})
+        rejected += failed
+        if model in VERSION_SCOPES:
+            bump_version(*{
+                (model, getattr(obj, VERSION_SCOPES[model]))
+                for obj, _ in objs})
+        progress = self.progress[file_name]
+        progress[0] += len(objs) - len(failed)
+        progress[1] += len(rejected)
+        if self.stream:
+            self.write_rejected(file_name, rejected)
+            self.stdout.write(
+                f'{file_name}: добавлено {progress[0]}, '
+                f'отклонено {progress[1]}')
+        else:
+            self.stdout.write(
+                f'{file_name}: добавлено {progress[0]}, '
+                f'пропущено {progress[1]}')
+
+    def build_chunk(self, parsed, model, foreign_keys):
+        """Сборка объектов пачки с отбором уже существующих и без связей"""
+        existing_ids = self.get_known_ids(model)
+        objs, rejected = [], []
+        for row, fields in parsed:
+            if not all(
+                    fields[field] in self.get_known_ids(related_model)
+                    for field, related_model in foreign_keys):
+                rejected.append((row, 'связанный объект не найден'))
+                continue
+            if fields['id'] in existing_ids:
+                continue
+            existing_ids.add(fields['id'])
+            objs.append((model(**fields), row))
+        return objs, rejected
+
+    def insert_chunk(self, model, objs):
+        """Вставка пачки, при нарушении ограничений - по одной строке"""
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    (obj for obj, _ in objs), batch_size=500)
+            return []
+        except IntegrityError:
+            pass
+        rejected = []
+        for obj, row in objs:
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create((obj,))
+            except IntegrityError as error:
+                rejected.append((row, f'нарушение ограничения: {error}'))
+        return rejected
+
+    def rejected_path(self, file_name):
+        """Путь к файлу отклоненных строк CSV файла"""
+        return os.path.join(
+            self.rejects_dir, f'{os.path.splitext(file_name)[0]}.rejected.csv')
+
+    def remove_rejected(self):
+        """Удаление файлов отклоненных строк перед новым импортом.
+
+        При продолжении импорта файлы дописываются, а новый импорт
+        начинается с пустых файлов, чтобы в них не попадали строки,
+        отклоненные прошлыми запусками."""
+        for file_name, *_ in IMPORT_FILES:
+            try:
+                os.remove(self.rejected_path(file_name))
+            except FileNotFoundError:
+                pass
+
+    def write_rejected(self, file_name, rejected):
+        """Дозапись отклоненных строк в файл рядом с результатами импорта"""
+        if not rejected:
+            return
+        header = read_header(file_name)
+        rejects_path = self.rejected_path(file_name)
+        write_header = not os.path.exists(rejects_path)
+        with open(rejects_path, mode='a', encoding='utf-8',
+                  newline='') as rejects_file:
+            writer = csv.writer(rejects_file)
+            if write_header:
+                writer.writerow((*header, 'error'))
+            for row, error in rejected:
+                writer.writerow(
+                    (*(row.get(column, '') for column in header), error))
+
+    def get_known_ids(self, model):
+        """Загрузка идентификаторов объектов модели один раз за импорт"""
+        if model not in self.known_ids:
+            self.known_ids[model] = set(
+                model.objects.values_list('id', flat=True))
+        return self.known_ids[model]
+
+    def load_chunk_ids(self, parsed, model, foreign_keys):
+        """Загрузка существующих идентификаторов, упомянутых в пачке"""
+        for field, related_model in (('id', model), *foreign_keys):
+            ids = {fields[field] for _, fields in parsed}
+            self.known_ids[related_model] = set(
+                related_model.objects.filter(id__in=ids).values_list(
+                    'id', flat=True))
+
     def import_data(self, file_name, import_function):
         """Общий метод для импорта данных из CSV файла"""
         with open(
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from reviews.models import Review, Title
+from reviews.versions import bump_version
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Команда для полного пересчета рейтингов произведений
+    по их отзывам с исправлением расхождений"""
+
+    help = 'Пересчитывает рейтинг, сумму оценок и число отзывов произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество произведений, пересчитываемых за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        processed = fixed = 0
+        while True:
+            titles = list(
+                Title.objects.filter(id__gt=last_id).order_by('id').only(
+                    'id', 'rating', 'score_sum', 'review_count'
+                )[:batch_size])
+            if not titles:
+                break
+            fixed += self.recompute_batch(titles)
+            processed += len(titles)
+            last_id = titles[-1].id
+            self.stdout.write(f'Обработано произведений: {processed}')
+        if fixed:
+            bump_version(Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчет рейтингов завершен. Исправлено: {fixed}.'))
+
+    def recompute_batch(self, titles):
+        """Пересчет одной пачки произведений в отдельной транзакции"""
+        with transaction.atomic():
+            totals = {
+                row['title_id']: (row['score_sum'], row['review_count'])
+                for row in Review.objects.filter(
+                    title_id__in=[title.id for title in titles]
+                ).values('title_id').annotate(
+                    score_sum=Sum('score'), review_count=Count('id')
+                ).order_by()
+            }
+            changed = []
+            for title in titles:
+                score_sum, review_count = totals.get(title.id, (0, 0))
+                rating = score_sum / review_count if review_count else None
+                if (title.score_sum, title.review_count, title.rating) != (
+                        score_sum, review_count, rating):
+                    title.score_sum = score_sum
+                    title.review_count = review_count
+                    title.rating = rating
+                    changed.append(title)
+            Title.objects.bulk_update(
+                changed, ('score_sum', 'review_count', 'rating'))
+        return len(changed)
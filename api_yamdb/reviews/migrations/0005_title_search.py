@@ -0,0 +1,80 @@
+# Generated by Django 3.2 on 2026-10-18 19:40
+
+from django.db import migrations
+
+# Триггеры индекса создаются SQL-запросами, и Django о них не знает. Схема
+# SQLite меняет таблицу пересозданием, поэтому любая следующая миграция,
+# изменяющая reviews_title (AlterField, RemoveField и т.п.), молча удалит
+# триггеры: такая миграция должна заново выполнить CREATE_SQL для
+# триггеров и перестроить индекс. Наличие триггеров после migrate
+# проверяет tests/test_14_title_search.py.
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE reviews_title_search USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_title_search_insert AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_search(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_search_delete AFTER DELETE ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_search(
+            reviews_title_search, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_search_update
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_search(
+            reviews_title_search, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO reviews_title_search(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO reviews_title_search(reviews_title_search) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_search_update',
+    'DROP TRIGGER IF EXISTS reviews_title_search_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_search_insert',
+    'DROP TABLE IF EXISTS reviews_title_search',
+)
+
+
+def run_sqlite(schema_editor, statements):
+    """Полнотекстовый индекс FTS5 доступен только в SQLite."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    run_sqlite(schema_editor, CREATE_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    run_sqlite(schema_editor, DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_importcheckpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,9 +1,19 @@
 """Модуль моделей приложения."""
+from contextvars import ContextVar
+
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from users.models import CustomUser
 
+_deleting_title_ids = ContextVar('deleting_title_ids', default=frozenset())
+
+
+def deleting_title_ids():
+    """Функция получения id произведений, удаляемых в текущем контексте."""
+    return _deleting_title_ids.get()
+
 
 class BaseModel(models.Model):
     """Абстрактная модель для жанров и категорий."""
@@ -49,6 +59,12 @@ class Title(models.Model):
     year = models.IntegerField(verbose_name='год выпуска')
     description = models.TextField(
         verbose_name='описание', null=True, blank=True)
+    rating = models.FloatField(
+        verbose_name='рейтинг', null=True, blank=True, editable=False)
+    score_sum = models.PositiveIntegerField(
+        verbose_name='сумма оценок', default=0, editable=False)
+    review_count = models.PositiveIntegerField(
+        verbose_name='количество отзывов', default=0, editable=False)
 
     class Meta:
         ordering = ('id',)
@@ -60,6 +76,19 @@ class Title(models.Model):
         """Метод возвращающий имя произведения."""
         return self.name
 
+    def delete(self, *args, **kwargs):
+        """
+        Метод удаления произведения.
+
+        Пока идет удаление, каскадно удаляемые отзывы не обновляют рейтинг
+        удаляемого произведения, иначе на каждый отзыв уходил бы UPDATE.
+        """
+        token = _deleting_title_ids.set(deleting_title_ids() | {self.id})
+        try:
+            return super().delete(*args, **kwargs)
+        finally:
+            _deleting_title_ids.reset(token)
+
 
 class TitleGenre(models.Model):
     """Модель для связи произведений и жанров."""
@@ -70,6 +99,12 @@ class TitleGenre(models.Model):
         Genre, on_delete=models.CASCADE, verbose_name='жанр')
 
     class Meta:
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'),
+                name='titlegenre_genre_title_idx'
+            ),
+        )
         verbose_name = 'произведение/жанр'
         verbose_name_plural = 'Произведение/Жанр'
 
@@ -89,8 +124,10 @@ class Review(models.Model):
             MinValueValidator(1, message='Введенная оценка ниже допустимой'),
             MaxValueValidator(10, message='Введенная оценка выше допустимой')]
     )
+    # Не auto_now_add, чтобы импорт сохранял даты публикации из файлов.
     pub_date = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name='Дата публикации',
         db_index=True
     )
@@ -100,6 +137,12 @@ class Review(models.Model):
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
         default_related_name = 'reviews'
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -111,6 +154,27 @@ class Review(models.Model):
         """Метод возвращающий текст ревью."""
         return self.text[:50]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Метод запоминающий загруженные произведение и оценку.
+
+        Если одно из полей отложено, состояние остается неизвестным до
+        изменения отзыва (см. обработчик review_changing).
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'title_id' in instance.__dict__ and 'score' in instance.__dict__:
+            instance._loaded_rating_state = (
+                instance.title_id, instance.score)
+        else:
+            instance._loaded_rating_state = None
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Метод сохранения отзыва вместе с пересчетом рейтинга."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Класс комментариев."""
@@ -120,8 +184,10 @@ class Comment(models.Model):
     review = models.ForeignKey(
         Review, on_delete=models.CASCADE, verbose_name='oтзыв')
     text = models.TextField(verbose_name='текст')
+    # Не auto_now_add, чтобы импорт сохранял даты публикации из файлов.
     pub_date = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name='Дата публикации',
         db_index=True
     )
@@ -131,7 +197,34 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         """Метод возвращающий текст комментария."""
         return self.text[:50]
+
+
+class ImportCheckpoint(models.Model):
+    """Модель контрольных точек потокового импорта CSV файлов."""
+
+    file_name = models.CharField(
+        max_length=255, unique=True, verbose_name='файл')
+    offset = models.BigIntegerField(
+        default=0, verbose_name='смещение в байтах')
+    last_id = models.BigIntegerField(
+        null=True, blank=True, verbose_name='последний идентификатор')
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='дата обновления')
+
+    class Meta:
+        verbose_name = 'контрольная точка импорта'
+        verbose_name_plural = 'Контрольные точки импорта'
+
+    def __str__(self):
+        """Метод возвращающий имя файла и смещение."""
+        return f'{self.file_name}:{self.offset}'
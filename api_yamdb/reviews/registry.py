@@ -0,0 +1,65 @@
+"""Модуль локального реестра жанров и категорий.
+
+Жанров и категорий мало, и меняются они редко, поэтому каждый процесс
+держит их в памяти и не обращается к базе на каждом запросе. Реестр
+модели перечитывается целиком, когда меняется ее версия в общем кэше
+(см. versions.py) и не реже раза в CATALOG_REGISTRY_MAX_AGE секунд, чтобы
+с кэшем процесса изменения из других процессов доходили с этой
+задержкой. При промахе по id или slug реестр перечитывается один раз,
+чтобы подхватить объекты, созданные в другом процессе. Запись не должна
+доверять реестру без проверки в базе: объект может быть уже удален.
+
+Выдаваемые объекты общие для всех запросов процесса и не должны
+изменяться.
+"""
+from collections import namedtuple
+from time import monotonic
+
+from django.conf import settings
+
+from .versions import get_versions
+
+Registry = namedtuple(
+    'Registry', ('version', 'loaded_at', 'by_id', 'by_slug'))
+
+_registries = {}
+
+
+def load_registry(model, version):
+    """Функция загрузки всех объектов модели в реестр."""
+    objects = list(model.objects.order_by('name'))
+    return Registry(
+        version,
+        monotonic(),
+        {obj.id: obj for obj in objects},
+        {obj.slug: obj for obj in objects},
+    )
+
+
+def get_registry(model, reload=False):
+    """Функция получения актуального реестра модели."""
+    version, = get_versions(model)
+    registry = _registries.get(model)
+    if (reload or registry is None or registry.version != version
+            or monotonic() - registry.loaded_at
+            >= settings.CATALOG_REGISTRY_MAX_AGE):
+        registry = _registries[model] = load_registry(model, version)
+    return registry
+
+
+def _lookup(model, index, key):
+    """Функция поиска объекта с одним перечитыванием реестра при промахе."""
+    obj = getattr(get_registry(model), index).get(key)
+    if obj is None:
+        obj = getattr(get_registry(model, reload=True), index).get(key)
+    return obj
+
+
+def get_by_id(model, obj_id):
+    """Функция получения объекта из реестра по id или None."""
+    return _lookup(model, 'by_id', obj_id)
+
+
+def get_by_slug(model, slug):
+    """Функция получения объекта из реестра по slug или None."""
+    return _lookup(model, 'by_slug', slug)
@@ -0,0 +1,89 @@
+"""Модуль маршрутизации чтений в реплики базы данных.
+
+Записи всегда идут в основную базу `default`. Чтения идут в реплику из
+DATABASE_REPLICAS только внутри области `replica_routing` одного
+запроса и только после вызова `use_replica`: вне запросов (команды,
+фоновые задачи, миграции) все работает с основной базой. Как только в
+области выполнена запись, следующие чтения этой области тоже идут в
+основную базу, чтобы запрос видел свои изменения.
+
+Реплика отстает от основной базы, поэтому `replica_is_fresh` разрешает
+чтение из нее, только если нужные модели не менялись последние
+REPLICA_LAG_SECONDS секунд. Так и клиент, только что изменивший данные,
+и кэш ответов, ключи которого строятся из версий моделей, не получат
+из реплики данных старее текущей версии.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from .versions import get_last_modified
+
+_routing = ContextVar('replica_routing', default=None)
+
+
+@contextmanager
+def replica_routing():
+    """Контекстный менеджер области маршрутизации чтений одного запроса."""
+    token = _routing.set({'alias': None, 'wrote': False})
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def use_replica():
+    """
+    Функция разрешения чтений из реплики в текущей области.
+
+    Реплика выбирается случайно один раз на область, чтобы все чтения
+    запроса видели одно состояние данных.
+    """
+    state = _routing.get()
+    if state is None or state['wrote'] or not settings.DATABASE_REPLICAS:
+        return None
+    state['alias'] = random.choice(settings.DATABASE_REPLICAS)
+    return state['alias']
+
+
+def replica_is_fresh(*items):
+    """Функция проверки, что модели не менялись за время отставания."""
+    if not items:
+        return True
+    return (time.time() - get_last_modified(*items)
+            >= settings.REPLICA_LAG_SECONDS)
+
+
+class ReplicaRouter:
+    """Роутер баз данных: записи в основную базу, чтения по области."""
+
+    def db_for_read(self, model, **hints):
+        """Метод выбора базы для чтения."""
+        state = _routing.get()
+        if state is None or state['wrote'] or state['alias'] is None:
+            return DEFAULT_DB_ALIAS
+        return state['alias']
+
+    def db_for_write(self, model, **hints):
+        """Метод выбора базы для записи, переключающий область на основную."""
+        state = _routing.get()
+        if state is not None:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Метод разрешения связей между объектами основной базы и реплик."""
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Метод запрета миграций реплик: схема приходит репликацией."""
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,51 @@
+"""Модуль полнотекстового поиска произведений.
+
+Поиск идет по виртуальной таблице FTS5, которую триггеры базы данных
+синхронизируют с названиями и описаниями произведений, в том числе при
+массовой загрузке через bulk_create. Результаты упорядочены по
+релевантности BM25, совпадения в названии весят больше, чем в описании.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+SEARCH_TABLE = 'reviews_title_search'
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+TOKEN_RE = re.compile(r'\w+')
+
+
+def build_match_query(text):
+    """
+    Функция построения запроса MATCH из пользовательской строки.
+
+    Каждое слово экранируется как фраза с поиском по префиксу, поэтому
+    операторы и кавычки FTS5 во вводе не вызывают синтаксических ошибок.
+    """
+    return ' '.join(
+        '"{}"*'.format(token.replace('"', '""'))
+        for token in TOKEN_RE.findall(text)
+    )
+
+
+def search_titles(queryset, text):
+    """Функция фильтрации произведений по полнотекстовому запросу."""
+    if connection.vendor != 'sqlite':
+        return queryset.filter(
+            Q(name__icontains=text) | Q(description__icontains=text))
+    match_query = build_match_query(text)
+    if not match_query:
+        return queryset.none()
+    title_table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=(SEARCH_TABLE,),
+        where=(
+            f'{SEARCH_TABLE}.rowid = {title_table}.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ),
+        params=(match_query,),
+        select={'search_rank': (
+            f'bm25({SEARCH_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})')},
+        order_by=('search_rank', 'id'),
+    )
@@ -0,0 +1,188 @@
+"""Модуль обработчиков сигналов приложения."""
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast, NullIf
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from users.models import CustomUser
+
+from .models import (Category, Comment, Genre, Review, Title, TitleGenre,
+                     deleting_title_ids)
+from .versions import bump_version
+
+VERSIONED_MODELS = (
+    Category, Comment, CustomUser, Genre, Review, Title, TitleGenre)
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """
+    Функция инкрементального обновления рейтинга произведения.
+
+    Сумма оценок, количество отзывов и рейтинг меняются одним UPDATE,
+    поэтому конкурентные изменения отзывов не теряются. Если сохраненные
+    суммы разошлись с отзывами и уменьшение сделало бы их
+    отрицательными, рейтинг пересчитывается полностью.
+    """
+    if title_id is None or (not score_delta and not count_delta):
+        return
+    score_sum = F('score_sum') + score_delta
+    review_count = F('review_count') + count_delta
+    updated = Title.objects.filter(
+        id=title_id,
+        score_sum__gte=max(-score_delta, 0),
+        review_count__gte=max(-count_delta, 0),
+    ).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=Cast(score_sum, FloatField()) / NullIf(review_count, 0),
+    )
+    if not updated:
+        recompute_title_rating(title_id)
+
+
+def recompute_title_rating(title_id):
+    """Функция полного пересчета рейтинга произведения по его отзывам."""
+    totals = Review.objects.filter(title_id=title_id).aggregate(
+        score_sum=Sum('score'), review_count=Count('id'))
+    score_sum = totals['score_sum'] or 0
+    review_count = totals['review_count']
+    Title.objects.filter(id=title_id).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=score_sum / review_count if review_count else None,
+    )
+
+
+def recompute_title_ratings(title_ids):
+    """
+    Функция пересчета рейтингов произведений по их отзывам.
+
+    Используется при вставке отзывов без сигналов (bulk_create), чтобы
+    рейтинги менялись в той же транзакции, что и отзывы.
+    """
+    totals = {
+        row['title_id']: (row['score_sum'], row['review_count'])
+        for row in Review.objects.filter(title_id__in=title_ids).values(
+            'title_id').annotate(
+            score_sum=Sum('score'), review_count=Count('id')).order_by()
+    }
+    titles = list(Title.objects.filter(id__in=title_ids).only('id'))
+    for title in titles:
+        title.score_sum, title.review_count = totals.get(title.id, (0, 0))
+        title.rating = (
+            title.score_sum / title.review_count
+            if title.review_count else None)
+    Title.objects.bulk_update(titles, ('score_sum', 'review_count', 'rating'))
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Обработчик создания и изменения отзыва."""
+    if raw:
+        return
+    score = int(instance.score)
+    loaded_state = getattr(instance, '_loaded_rating_state', None)
+    bump_scoped_versions(
+        Review, instance.title_id, loaded_state and loaded_state[0])
+    if created:
+        update_title_rating(instance.title_id, score, 1)
+    elif loaded_state is None:
+        recompute_title_rating(instance.title_id)
+    else:
+        old_title_id, old_score = loaded_state
+        if old_title_id != instance.title_id:
+            update_title_rating(old_title_id, -old_score, -1)
+            update_title_rating(instance.title_id, score, 1)
+        else:
+            update_title_rating(instance.title_id, score - old_score, 0)
+    instance._loaded_rating_state = (instance.title_id, score)
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_delete, sender=Review)
+def review_changing(sender, instance, raw=False, **kwargs):
+    """
+    Обработчик перед изменением или удалением отзыва.
+
+    Если произведение или оценка были отложены при загрузке, их прежние
+    значения читаются из базы, чтобы обновить рейтинг инкрементально.
+    """
+    if (raw or instance._state.adding
+            or getattr(instance, '_loaded_rating_state', ()) is not None):
+        return
+    instance._loaded_rating_state = Review.objects.filter(
+        id=instance.id).values_list('title_id', 'score').first()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Обработчик удаления отзыва, в том числе каскадного."""
+    try:
+        loaded_state = instance._loaded_rating_state
+    except AttributeError:
+        loaded_state = (instance.title_id, int(instance.score))
+    if loaded_state is None:
+        # Строки отзыва уже не было в базе.
+        return
+    title_id, score = loaded_state
+    if title_id not in deleting_title_ids():
+        update_title_rating(title_id, -score, -1)
+    bump_scoped_versions(Review, title_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    """Обработчик изменения комментариев отзыва."""
+    bump_scoped_versions(Comment, instance.review_id)
+
+
+@receiver(post_save, sender=CustomUser)
+def author_renamed(sender, instance, created, raw=False, update_fields=None,
+                   **kwargs):
+    """
+    Обработчик смены имени пользователя.
+
+    Имя автора входит в ответы с отзывами и комментариями, поэтому
+    сбрасываются версии отзывов произведений и комментариев отзывов,
+    где пользователь автор.
+    """
+    if raw or created or not instance.token_claims_changed(
+            update_fields, fields=('username',)):
+        return
+    bump_scoped_versions(Review, *Review.objects.filter(
+        author=instance).values_list('title_id', flat=True).distinct())
+    bump_scoped_versions(Comment, *Comment.objects.filter(
+        author=instance).values_list('review_id', flat=True).distinct())
+
+
+def bump_scoped_versions(model, *scopes):
+    """Функция сброса версий областей модели после фиксации транзакции."""
+    transaction.on_commit(partial(bump_version, *(
+        (model, scope) for scope in set(scopes) if scope is not None)))
+
+
+def model_changed(sender, **kwargs):
+    """
+    Обработчик изменения объекта, сбрасывающий версию модели.
+
+    Версия меняется после фиксации транзакции, чтобы параллельный запрос
+    не закэшировал под новой версией еще не зафиксированные данные.
+    """
+    transaction.on_commit(partial(bump_version, sender))
+
+
+for versioned_model in VERSIONED_MODELS:
+    post_save.connect(model_changed, sender=versioned_model)
+    post_delete.connect(model_changed, sender=versioned_model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    """Обработчик изменения жанров произведения через set() и add()."""
+    if action.startswith('post_'):
+        transaction.on_commit(partial(bump_version, TitleGenre))
@@ -0,0 +1,23 @@
+"""Модуль настройки соединений SQLite.
+
+При открытии каждого соединения с SQLite выполняются PRAGMA из
+настройки SQLITE_PRAGMAS: журнал WAL позволяет читателям не ждать
+писателя, synchronous=NORMAL в режиме WAL сбрасывает данные на диск
+только при контрольных точках, mmap_size и cache_size уменьшают число
+системных вызовов чтения, а busy_timeout заставляет писателей ждать
+блокировку вместо немедленной ошибки. Вместе с CONN_MAX_AGE соединение
+и его настройки переживают запрос.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Обработчик открытия соединения, применяющий PRAGMA SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,74 @@
+"""Модуль счетчиков версий моделей для инвалидации кэша.
+
+Версия модели хранится в кэше Django и увеличивается при каждом
+изменении ее объектов, поэтому ключи, построенные из версий, после
+изменения данных просто перестают совпадать. Вместо модели можно
+передать пару (модель, область), например отзывы одного произведения,
+тогда версия меняется только при изменениях в этой области. Вместе с
+версией запоминается время последнего изменения.
+"""
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = 'model-version:{}'
+MODIFIED_KEY = 'model-modified:{}'
+
+
+def version_name(item):
+    """Функция получения имени версии модели или области модели."""
+    if isinstance(item, tuple):
+        model, scope = item
+        return f'{model._meta.label_lower}:{scope}'
+    return item._meta.label_lower
+
+
+def version_key(item):
+    """Функция получения ключа версии модели."""
+    return VERSION_KEY.format(version_name(item))
+
+
+def get_versions(*items):
+    """Функция получения текущих версий моделей одним запросом к кэшу."""
+    keys = [version_key(item) for item in items]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def get_last_modified(*items):
+    """
+    Функция получения времени последнего изменения моделей.
+
+    Для моделей, время изменения которых неизвестно, оно считается
+    текущим, чтобы клиент не получил устаревших данных.
+    """
+    keys = [MODIFIED_KEY.format(version_name(item)) for item in items]
+    modified = cache.get_many(keys)
+    for key in keys:
+        if key not in modified:
+            cache.add(key, time.time(), timeout=None)
+            modified[key] = cache.get(key)
+    return max(modified.values(), default=None)
+
+
+def bump_version(*items):
+    """
+    Функция увеличения версий моделей.
+
+    Если версия вытеснена из кэша, она создается заново из текущего
+    времени, чтобы не совпасть ни с одной из прежних версий.
+    """
+    now = time.time()
+    for item in items:
+        key = version_key(item)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+    cache.set_many({
+        MODIFIED_KEY.format(version_name(item)): now for item in items
+    }, timeout=None)
@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import CustomUser
+from .models import CustomUser, OutgoingEmail
 
 OBJECTS_PER_PAGE = 10
 
@@ -26,3 +26,14 @@ class UsersAdmin(UserAdmin):
 
 
 admin.site.register(CustomUser, UsersAdmin)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Класс настройки отображения очереди исходящей почты."""
+
+    list_display = ('id', 'subject', 'recipients', 'created_at', 'attempts',
+                    'send_after', 'sent_at',)
+    list_filter = ('sent_at',)
+    list_per_page = OBJECTS_PER_PAGE
+    empty_value_display = 'Не задано'
@@ -0,0 +1,68 @@
+"""Модуль отзыва данных пользователя в выпущенных токенах доступа.
+
+Токен доступа содержит имя, роль и признак суперпользователя, поэтому
+аутентификация обходится без базы данных. Когда эти поля или признак
+активности меняются, модель пользователя записывает время изменения в
+поле `claims_changed_at`, а оно попадает в кэш. Токены, выпущенные
+раньше, перестают считаться достоверными: пользователь загружается из
+базы, где проверяются его существование и активность. При нескольких
+процессах кэш должен быть общим; значение из базы кэшируется на
+TOKEN_CLAIMS_CACHE_TIMEOUT секунд, поэтому и с кэшем процесса изменение
+доходит до всех процессов не позже этого срока.
+"""
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+CLAIMS_CHANGED_KEY = 'token-claims-changed:{}'
+
+# Поля пользователя, от которых зависят данные в токене доступа.
+TOKEN_CLAIM_FIELDS = ('username', 'role', 'is_superuser', 'is_active')
+
+# Время изменения удаленного пользователя: его токены всегда устаревшие.
+DELETED = float('inf')
+
+
+def remember_claims_changed_at(user_id, changed_at, replace=True):
+    """
+    Функция записи в кэш времени изменения данных токена.
+
+    При replace=False значение, уже записанное в кэш, не заменяется.
+    """
+    (cache.set if replace else cache.add)(
+        CLAIMS_CHANGED_KEY.format(user_id), changed_at,
+        settings.TOKEN_CLAIMS_CACHE_TIMEOUT)
+
+
+def claims_changed_at(user_id):
+    """
+    Функция получения времени изменения данных токена пользователя.
+
+    Возвращает время в секундах от начала эпохи, 0 для пользователя без
+    изменений и DELETED для несуществующего пользователя.
+    """
+    changed_at = cache.get(CLAIMS_CHANGED_KEY.format(user_id))
+    if changed_at is None:
+        rows = list(get_user_model().objects.filter(id=user_id).values_list(
+            'claims_changed_at', flat=True))
+        if not rows:
+            changed_at = DELETED
+        else:
+            changed_at = rows[0].timestamp() if rows[0] else 0
+        remember_claims_changed_at(user_id, changed_at)
+    return changed_at
+
+
+def revoke_token_claims(user_id, changed_at):
+    """
+    Функция отзыва данных во всех выпущенных токенах пользователя.
+
+    Кэш обновляется сразу и повторно после фиксации транзакции, чтобы
+    параллельный запрос не закэшировал прежнее значение из базы.
+    """
+    remember_claims_changed_at(user_id, changed_at)
+    transaction.on_commit(
+        partial(remember_claims_changed_at, user_id, changed_at))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import dispatch_pending
+
+POLL_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    """Команда для отправки писем из очереди исходящей почты
+    пачками через одно соединение с почтовым сервером"""
+
+    help = 'Отправляет письма из очереди исходящей почты.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя очередь с интервалом.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=POLL_INTERVAL,
+            help='Интервал проверки очереди в секундах для --loop.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = dispatch_pending()
+            if sent or failed or not options['loop']:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, не отправлено: {failed}')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('Отправка почты завершена.'))
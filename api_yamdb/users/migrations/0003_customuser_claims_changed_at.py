@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='claims_changed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Изменение данных токена'),
+        ),
+    ]
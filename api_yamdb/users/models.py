@@ -1,6 +1,9 @@
 """Модуль модели приложения Users."""
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
+
+from .claims import TOKEN_CLAIM_FIELDS, revoke_token_claims
 
 ROLE_CHOICES = (
     ('user', 'user'),
@@ -17,6 +20,9 @@ class CustomUser(AbstractUser):
     role = models.CharField(
         'Роль', max_length=16, choices=ROLE_CHOICES, default='user'
     )
+    claims_changed_at = models.DateTimeField(
+        'Изменение данных токена', null=True, blank=True, editable=False
+    )
     REQUIRED_FIELDS = ('email',)
 
     class Meta:
@@ -27,3 +33,84 @@ class CustomUser(AbstractUser):
     def __str__(self):
         """Метод возвращающий имя пользователя."""
         return self.username
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Метод запоминающий загруженные данные токена доступа."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_token_claims = instance.token_claims()
+        return instance
+
+    def token_claims(self):
+        """Метод получения загруженных полей данных токена."""
+        return {
+            name: self.__dict__[name] for name in TOKEN_CLAIM_FIELDS
+            if name in self.__dict__
+        }
+
+    def token_claims_changed(self, update_fields=None,
+                             fields=TOKEN_CLAIM_FIELDS):
+        """
+        Метод проверки, изменились ли данные токена после загрузки.
+
+        Проверяются поля fields из TOKEN_CLAIM_FIELDS. Пользователь с
+        первичным ключом, загруженный не из базы, считается измененным.
+        """
+        loaded = getattr(self, '_loaded_token_claims', None)
+        if loaded is None:
+            return True
+        return any(
+            name not in loaded or loaded[name] != self.__dict__[name]
+            for name in fields
+            if name in self.__dict__
+            and (update_fields is None or name in update_fields))
+
+    def save(self, *args, **kwargs):
+        """Метод сохранения с отзывом данных в выпущенных токенах."""
+        update_fields = kwargs.get('update_fields')
+        revoked = self.pk is not None and self.token_claims_changed(
+            update_fields)
+        if revoked:
+            self.claims_changed_at = timezone.now()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'claims_changed_at'}
+        super().save(*args, **kwargs)
+        self._loaded_token_claims = self.token_claims()
+        if revoked:
+            revoke_token_claims(self.id, self.claims_changed_at.timestamp())
+
+
+class OutgoingEmail(models.Model):
+    """Модель письма в очереди исходящей почты."""
+
+    subject = models.CharField(max_length=255, verbose_name='тема')
+    body = models.TextField(verbose_name='текст')
+    from_email = models.CharField(max_length=254, verbose_name='отправитель')
+    recipients = models.JSONField(verbose_name='получатели')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='дата создания')
+    send_after = models.DateTimeField(
+        default=timezone.now, verbose_name='отправить после')
+    claim_token = models.CharField(
+        max_length=32, blank=True, verbose_name='метка обработчика')
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='попытки отправки')
+    last_error = models.TextField(blank=True, verbose_name='последняя ошибка')
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='дата отправки')
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'send_after'),
+                name='outgoingemail_pending_idx'
+            ),
+        )
+
+    def __str__(self):
+        """Метод возвращающий тему и получателей письма."""
+        return f'{self.subject}: {", ".join(self.recipients)}'
@@ -0,0 +1,172 @@
+"""Модуль очереди исходящей почты.
+
+Письма сначала сохраняются в таблицу OutgoingEmail, а отправляются
+позже пачками через одно соединение с почтовым бэкендом. Режим отправки
+задается настройкой EMAIL_OUTBOX_DISPATCH:
+
+* thread - фоновый поток процесса, который будится после фиксации
+  транзакции с новым письмом;
+* worker - только отдельный процесс `python manage.py send_emails --loop`;
+* eager - сразу после фиксации транзакции в том же потоке (для тестов).
+
+Неотправленные письма повторяются с экспоненциальной задержкой, пока не
+исчерпано EMAIL_OUTBOX_MAX_ATTEMPTS попыток. Пачка захватывается меткой
+обработчика на EMAIL_OUTBOX_LEASE секунд, поэтому несколько обработчиков
+не отправят одно письмо дважды, а письма упавшего обработчика снова
+станут доступны после истечения аренды.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+_wakeup_lock = threading.Lock()
+_wakeup_pending = False
+
+
+def enqueue_email(subject, message, recipient_list, from_email=None):
+    """Функция постановки письма в очередь исходящей почты."""
+    email = OutgoingEmail.objects.create(
+        subject=subject, body=message, recipients=list(recipient_list),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL)
+    mode = settings.EMAIL_OUTBOX_DISPATCH
+    if mode == 'eager':
+        transaction.on_commit(dispatch_pending)
+    elif mode == 'thread':
+        transaction.on_commit(wake_dispatcher)
+    return email
+
+
+def pending_emails(now):
+    """Функция выборки писем, которые пора отправить."""
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True, send_after__lte=now,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+
+
+def claim_batch(batch_size):
+    """Функция захвата пачки писем меткой текущего обработчика."""
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    ids = list(pending_emails(now).order_by('send_after', 'id').values_list(
+        'id', flat=True)[:batch_size])
+    pending_emails(now).filter(id__in=ids).update(
+        claim_token=token,
+        send_after=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE))
+    return list(OutgoingEmail.objects.filter(claim_token=token))
+
+
+def dispatch_batch(batch_size=None):
+    """
+    Функция отправки одной пачки писем через одно соединение.
+
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    batch = claim_batch(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+    sent, failed = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+        for email in batch:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email,
+                email.recipients, connection=connection)
+            try:
+                if not connection.send_messages([message]):
+                    raise RuntimeError('Бэкенд не отправил письмо.')
+            except Exception as error:
+                failed.append((email, error))
+            else:
+                sent.append(email.id)
+    except Exception as error:
+        done = set(sent) | {email.id for email, _ in failed}
+        failed.extend(
+            (email, error) for email in batch if email.id not in done)
+    finally:
+        connection.close()
+    save_results(sent, failed)
+    return len(sent), len(failed)
+
+
+def save_results(sent, failed):
+    """Функция сохранения результатов отправки пачки."""
+    now = timezone.now()
+    OutgoingEmail.objects.filter(id__in=sent).update(
+        sent_at=now, claim_token='', last_error='')
+    for email, error in failed:
+        email.attempts += 1
+        email.claim_token = ''
+        email.last_error = repr(error)
+        email.send_after = now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+            * 2 ** (email.attempts - 1))
+        logger.warning(
+            'Письмо %s не отправлено (попытка %s): %r',
+            email.id, email.attempts, error)
+    OutgoingEmail.objects.bulk_update(
+        [email for email, _ in failed],
+        ('attempts', 'claim_token', 'last_error', 'send_after'))
+
+
+def dispatch_pending():
+    """Функция отправки всех писем, которые пора отправить."""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = dispatch_batch()
+        total_sent += sent
+        total_failed += failed
+        if not sent and not failed:
+            return total_sent, total_failed
+
+
+def next_retry_delay():
+    """Функция получения задержки до ближайшего повтора или None."""
+    send_after = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    ).order_by('send_after').values_list('send_after', flat=True).first()
+    if send_after is None:
+        return None
+    return max((send_after - timezone.now()).total_seconds(), 0)
+
+
+def wake_dispatcher():
+    """Функция запуска фоновой отправки, если она еще не запланирована."""
+    global _wakeup_pending
+    with _wakeup_lock:
+        if _wakeup_pending:
+            return
+        _wakeup_pending = True
+    _executor.submit(run_dispatcher)
+
+
+def run_dispatcher():
+    """Функция фоновой отправки с планированием повторов."""
+    global _wakeup_pending
+    with _wakeup_lock:
+        _wakeup_pending = False
+    try:
+        dispatch_pending()
+        delay = next_retry_delay()
+    except Exception:
+        logger.exception('Ошибка фоновой отправки почты')
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY
+    finally:
+        connections.close_all()
+    if delay is not None:
+        timer = threading.Timer(delay, wake_dispatcher)
+        timer.daemon = True
+        timer.start()
@@ -0,0 +1,12 @@
+"""Модуль обработчиков сигналов приложения Users."""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .claims import DELETED, revoke_token_claims
+from .models import CustomUser
+
+
+@receiver(post_delete, sender=CustomUser)
+def user_deleted(sender, instance, **kwargs):
+    """Обработчик удаления пользователя, в том числе каскадного."""
+    revoke_token_claims(instance.id, DELETED)
@@ -0,0 +1,158 @@
+"""Сравнение пропускной способности синхронных и асинхронных эндпоинтов.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_async_views.py --requests 400 --concurrency 20
+
+Запросы отправляются напрямую в ASGI-приложение проекта без сетевого
+сервера, несколько запросов одновременно. Синхронные представления DRF
+под ASGI выполняются по очереди в одном потоке, асинхронные - в цикле
+событий с работой ORM в пуле потоков. Параметр --db-latency-ms добавляет
+задержку к каждому SQL-запросу, чтобы смоделировать сетевую базу данных:
+на локальном SQLite ожидать базу почти не приходится.
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def populate(db_name, titles, reviews_per_title):
+    from django.core.management import call_command
+    from django.db import connections
+
+    from reviews.models import Category, Genre, Review, Title, TitleGenre
+    from users.models import CustomUser
+
+    connections['default'].close()
+    connections['default'].settings_dict['NAME'] = db_name
+    call_command('migrate', verbosity=0)
+    category = Category.objects.create(name='Фильмы', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    users = CustomUser.objects.bulk_create(
+        CustomUser(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(reviews_per_title))
+    users = list(CustomUser.objects.order_by('id'))
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(titles))
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title_id=title_id, genre=genre) for title_id in title_ids)
+    Review.objects.bulk_create(
+        Review(title_id=title_id, author=user, text='Отзыв', score=7)
+        for title_id in title_ids for user in users)
+    connections['default'].close()
+    return title_ids
+
+
+def add_db_latency(latency):
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if delay not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install, weak=False)
+
+
+async def call(application, path):
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path,
+        'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+    }
+    status = None
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+async def measure(application, paths, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(path):
+        async with semaphore:
+            return await call(application, path)
+
+    started = time.perf_counter()
+    statuses = await asyncio.gather(*(limited(path) for path in paths))
+    elapsed = time.perf_counter() - started
+    assert set(statuses) == {200}, statuses
+    return len(paths) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=200)
+    parser.add_argument('--reviews-per-title', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--db-latency-ms', type=float, default=0)
+    args = parser.parse_args()
+    if args.titles < 1:
+        parser.error('--titles должно быть не меньше 1.')
+
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver']
+    with tempfile.TemporaryDirectory() as directory:
+        title_ids = populate(
+            os.path.join(directory, 'bench.sqlite3'), args.titles,
+            args.reviews_per_title)
+        if args.db_latency_ms:
+            add_db_latency(args.db_latency_ms / 1000)
+        application = get_asgi_application()
+        # Кэш ответов есть только у синхронных эндпоинтов, поэтому каждый
+        # адрес уникален, чтобы сравнивать обработку запросов, а не кэш.
+        templates = ('titles/?page={page}&n={idx}',
+                     'titles/{title_id}/?n={idx}',
+                     'titles/{title_id}/reviews/?n={idx}')
+        # Не дальше последней страницы: за ней список отвечает 404.
+        pages = min(10, math.ceil(
+            len(title_ids) / settings.REST_FRAMEWORK['PAGE_SIZE']))
+        requests = [
+            templates[idx % len(templates)].format(
+                idx=idx, page=idx % pages + 1,
+                title_id=title_ids[idx % len(title_ids)])
+            for idx in range(args.requests)
+        ]
+        results = {}
+        for mode, prefix in (('синхронные', '/api/v1/'),
+                             ('асинхронные', '/api/v1/async/')):
+            results[mode] = asyncio.run(measure(
+                application, [prefix + path for path in requests],
+                args.concurrency))
+            print(f'{mode}: {results[mode]:.0f} запросов/с')
+        print(f'ускорение: '
+              f'{results["асинхронные"] / results["синхронные"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""Замер задержек эндпоинтов на большом сгенерированном наборе данных.
+
+Запуск из корня репозитория на временной базе, заполненной командой
+generate_dataset:
+
+    python benchmarks/bench_endpoints.py --titles 1000000 \\
+        --reviews 10000000 --comments 1000000 --users 20000 \\
+        --output release.json
+
+или на уже заполненной базе:
+
+    python benchmarks/bench_endpoints.py --database api_yamdb/db.sqlite3
+
+Каждый эндпоинт вызывается --requests раз через тестовый клиент Django
+со случайными, но воспроизводимыми по --seed параметрами. По умолчанию
+каждый адрес уникален, чтобы мерить обработку запроса, а не кэш ответов
+(--cached отключает это). Результат - JSON с задержками p50/p95/p99 в
+миллисекундах, числом SQL-запросов на запрос и строк ответа в секунду;
+JSON двух прогонов можно сравнивать между релизами.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def use_database(db_name):
+    from django.db import connections
+
+    connections['default'].close()
+    connections['default'].settings_dict['NAME'] = db_name
+
+
+def generate(db_name, args):
+    from django.core.management import call_command
+
+    use_database(db_name)
+    call_command('migrate', verbosity=0)
+    call_command(
+        'generate_dataset', users=args.users, genres=args.genres,
+        categories=args.categories, titles=args.titles,
+        reviews=args.reviews, comments=args.comments, seed=args.seed,
+        stdout=sys.stderr)
+
+
+def sample_ids(rng, model, count):
+    """Случайные существующие идентификаторы без загрузки всей таблицы."""
+    from django.db.models import Max, Min
+
+    bounds = model.objects.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        raise SystemExit(f'Таблица {model._meta.db_table} пуста.')
+    span = range(bounds['low'], bounds['high'] + 1)
+    candidates = rng.sample(span, min(count * 2, len(span)))
+    ids = list(model.objects.filter(id__in=candidates).values_list(
+        'id', flat=True))
+    rng.shuffle(ids)
+    return [ids[idx % len(ids)] for idx in range(count)]
+
+
+def build_requests(rng, args):
+    """Запросы к каждому эндпоинту: метод, адрес и тело."""
+    from django.conf import settings
+    from django.contrib.auth.tokens import default_token_generator
+
+    from reviews.models import Title
+    from users.models import CustomUser
+
+    def unique(path, idx):
+        return path if args.cached else f'{path}&n={idx}'
+
+    # Страницы за последней дают 404, поэтому номер ограничен их числом.
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    max_page = max(min(
+        args.max_page, math.ceil(Title.objects.count() / page_size)), 1)
+    title_ids = sample_ids(rng, Title, args.requests)
+    user_ids = sample_ids(rng, CustomUser, args.requests)
+    users = CustomUser.objects.in_bulk(set(user_ids))
+    return {
+        'titles_list': [
+            ('get', unique(
+                f'/api/v1/titles/?page={rng.randint(1, max_page)}', idx),
+             None)
+            for idx in range(args.requests)],
+        'title_detail': [
+            ('get', unique(f'/api/v1/titles/{title_id}/?', idx), None)
+            for idx, title_id in enumerate(title_ids)],
+        'title_reviews': [
+            ('get', unique(f'/api/v1/titles/{title_id}/reviews/?', idx), None)
+            for idx, title_id in enumerate(title_ids)],
+        'auth_token': [
+            ('post', '/api/v1/auth/token/', {
+                'username': users[user_id].username,
+                'confirmation_code': default_token_generator.make_token(
+                    users[user_id]),
+            })
+            for user_id in user_ids],
+    }
+
+
+def count_rows(response):
+    data = response.json()
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return len(data['results'])
+    return 1
+
+
+def measure(client, requests, warmup):
+    from django.db import connection
+
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    for method, path, data in requests[:warmup]:
+        getattr(client, method)(path, data=data)
+    latencies, rows = [], 0
+    with connection.execute_wrapper(count_queries):
+        for method, path, data in requests:
+            started = time.perf_counter()
+            response = getattr(client, method)(path, data=data)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, (path, response.content)
+            rows += count_rows(response)
+    p50, p95, p99 = (
+        statistics.quantiles(latencies, n=100, method='inclusive')[idx]
+        for idx in (49, 94, 98))
+    return {
+        'requests': len(requests),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+        'queries_per_request': round(queries / len(requests), 2),
+        'rows_per_second': round(rows / sum(latencies), 1),
+    }
+
+
+def dataset_counts():
+    from reviews.models import Comment, Genre, Review, Title
+    from users.models import CustomUser
+
+    return {
+        model._meta.model_name: model.objects.count()
+        for model in (CustomUser, Genre, Title, Review, Comment)}
+
+
+def revision():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'), cwd=BASE_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    from django.test import Client
+
+    rng = random.Random(args.seed)
+    requests = build_requests(rng, args)
+    client = Client()
+    endpoints = {}
+    for name, endpoint_requests in requests.items():
+        if args.endpoints and name not in args.endpoints:
+            continue
+        print(f'{name}...', file=sys.stderr)
+        endpoints[name] = measure(client, endpoint_requests, args.warmup)
+    return {
+        'revision': revision(),
+        'dataset': dataset_counts(),
+        'requests_per_endpoint': args.requests,
+        'cached': args.cached,
+        'endpoints': endpoints,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        '--database', help='Заполненная база SQLite вместо генерации.')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--categories', type=int, default=5)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--comments', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--max-page', type=int, default=100)
+    parser.add_argument('--cached', action='store_true')
+    parser.add_argument('--endpoints', nargs='*')
+    parser.add_argument('--output', help='Файл для JSON-результата.')
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+    from django.conf import settings
+
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver']
+    with tempfile.TemporaryDirectory() as directory:
+        if args.database:
+            use_database(os.path.abspath(args.database))
+        else:
+            generate(os.path.join(directory, 'bench.sqlite3'), args)
+        result = run(args)
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
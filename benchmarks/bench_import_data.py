@@ -0,0 +1,110 @@
+"""Сравнение скорости построчного, пакетного и параллельного import_data.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_import_data.py --reviews 20000
+
+Для каждого режима создается отдельная временная база SQLite, CSV файлы
+синтезируются во временной директории. Результат - строк в секунду.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def write_csv(directory, file_name, header, rows):
+    with open(os.path.join(directory, file_name), 'w', encoding='utf-8',
+              newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return len(rows)
+
+
+def generate_data(directory, reviews):
+    users = max(reviews // 10, 1)
+    titles = max(reviews // 10, 1)
+    total = write_csv(directory, 'genre.csv', ('id', 'name', 'slug'), [
+        (pk, f'Жанр {pk}', f'genre-{pk}') for pk in range(1, 11)])
+    total += write_csv(directory, 'category.csv', ('id', 'name', 'slug'), [
+        (pk, f'Категория {pk}', f'category-{pk}') for pk in range(1, 4)])
+    total += write_csv(
+        directory, 'titles.csv', ('id', 'name', 'year', 'category'), [
+            (pk, f'Произведение {pk}', 1900 + pk % 120, pk % 3 + 1)
+            for pk in range(1, titles + 1)])
+    total += write_csv(
+        directory, 'genre_title.csv', ('id', 'title_id', 'genre_id'), [
+            (pk, pk, pk % 10 + 1) for pk in range(1, titles + 1)])
+    total += write_csv(
+        directory, 'users.csv',
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'), [
+            (pk, f'user{pk}', f'user{pk}@yamdb.fake', 'user', '', '', '')
+            for pk in range(1, users + 1)])
+    total += write_csv(
+        directory, 'review.csv',
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'), [
+            (pk, pk % titles + 1, f'Отзыв {pk}', pk // titles + 1,
+             pk % 10 + 1, '2020-01-01T00:00:00Z')
+            for pk in range(1, reviews + 1)])
+    total += write_csv(
+        directory, 'comments.csv',
+        ('id', 'review_id', 'text', 'author', 'pub_date'), [
+            (pk, pk, f'Комментарий {pk}', pk % users + 1,
+             '2020-01-01T00:00:00Z')
+            for pk in range(1, reviews + 1)])
+    return total
+
+
+def run(directory, db_name, *options):
+    from django.core.management import call_command
+    from django.db import connections
+
+    connections['default'].close()
+    connections['default'].settings_dict['NAME'] = db_name
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    call_command(
+        'import_data', '--path', directory, *options, stdout=io.StringIO())
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+
+    with tempfile.TemporaryDirectory() as directory:
+        rows = generate_data(directory, args.reviews)
+        results = {}
+        for mode, options in (
+                ('построчный', ()),
+                ('пакетный', ('--bulk', '--chunk-size',
+                              str(args.chunk_size))),
+                ('параллельный', ('--workers', str(args.workers),
+                                  '--chunk-size', str(args.chunk_size)))):
+            db_name = os.path.join(directory, f'{len(results)}.sqlite3')
+            elapsed = run(directory, db_name, *options)
+            results[mode] = rows / elapsed
+            print(f'{mode}: {rows} строк за {elapsed:.2f} с, '
+                  f'{results[mode]:.0f} строк/с')
+        for mode in ('пакетный', 'параллельный'):
+            print(f'ускорение ({mode}): '
+                  f'{results[mode] / results["построчный"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Сравнение смешанной нагрузки на SQLite до и после настройки PRAGMA.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_sqlite_tuning.py --operations 2000 --threads 8
+
+Для каждого режима создается отдельная временная база SQLite. Несколько
+потоков выполняют чтения списка отзывов и записи новых отзывов в заданной
+пропорции, закрывая соединение после каждой операции так же, как это
+происходит по окончании HTTP-запроса. Базовый режим - настройки SQLite по
+умолчанию без постоянных соединений, настроенный - SQLITE_PRAGMAS и
+CONN_MAX_AGE из настроек проекта. Результат - операций в секунду.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def populate(titles):
+    from django.core.management import call_command
+
+    from reviews.models import Category, Title
+
+    call_command('migrate', verbosity=0)
+    category = Category.objects.create(name='Фильмы', slug='films')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(titles))
+    return list(Title.objects.values_list('id', flat=True))
+
+
+def worker(number, operations, write_ratio, title_ids, errors):
+    from django.db import close_old_connections, connections
+
+    from reviews.models import Review
+    from users.models import CustomUser
+
+    close_old_connections()
+    author = CustomUser.objects.create(
+        username=f'bench{number}', email=f'bench{number}@yamdb.fake')
+    close_old_connections()
+    writes = 0
+    try:
+        for idx in range(operations):
+            title_id = title_ids[idx % len(title_ids)]
+            if idx * write_ratio >= writes + 1:
+                Review.objects.create(
+                    title_id=title_ids[writes % len(title_ids)],
+                    author=author, text='Отзыв', score=7)
+                writes += 1
+            else:
+                list(Review.objects.filter(title_id=title_id).select_related(
+                    'author')[:10])
+            close_old_connections()
+    except Exception as error:
+        errors.append(error)
+    finally:
+        connections.close_all()
+
+
+def measure(db_name, pragmas, conn_max_age, args):
+    from django.conf import settings
+    from django.db import connections
+
+    connections.close_all()
+    settings.SQLITE_PRAGMAS = pragmas
+    database = connections['default'].settings_dict
+    database['NAME'] = db_name
+    database['CONN_MAX_AGE'] = conn_max_age
+    title_ids = populate(args.titles)
+    connections.close_all()
+    per_thread = args.operations // args.threads
+    errors = []
+    threads = [
+        threading.Thread(target=worker, args=(
+            number, per_thread, args.write_ratio, title_ids, errors))
+        for number in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    connections.close_all()
+    return per_thread * args.threads / elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--operations', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--titles', type=int, default=100)
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+    from django.conf import settings
+
+    modes = (
+        ('по умолчанию', {}, 0),
+        ('настроенная', dict(settings.SQLITE_PRAGMAS),
+         settings.DATABASES['default']['CONN_MAX_AGE']),
+    )
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, pragmas, conn_max_age in modes:
+            results[mode], errors = measure(
+                os.path.join(directory, f'{len(results)}.sqlite3'),
+                pragmas, conn_max_age, args)
+            print(f'{mode}: {results[mode]:.0f} операций/с, '
+                  f'ошибок: {len(errors)}')
+            for error in errors[:3]:
+                print(f'    {error!r}')
+    print(f'ускорение: '
+          f'{results["настроенная"] / results["по умолчанию"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+from django.conf import settings
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,4 +34,16 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_cache',
+    'tests.fixtures.fixture_email',
+    'tests.fixtures.fixture_query_budget',
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    # Тестовая база в файле, а не в памяти: потоки в тестах конкурентного
+    # доступа получают обычные блокировки SQLite с ожиданием вместо
+    # мгновенных ошибок `database table is locked` общего кэша.
+    settings.DATABASES['default']['TEST']['NAME'] = os.path.join(
+        MANAGE_PATH, 'test_db.sqlite3')
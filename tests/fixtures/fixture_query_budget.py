@@ -0,0 +1,230 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.v1 import async_views
+from api.v1.authentication import RoleAccessToken
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+from users.models import CustomUser
+
+ROLES = ('user', 'moderator', 'admin')
+
+
+def title_data(state):
+    return {
+        'name': 'Новое произведение', 'year': 2000,
+        'genre': [state['genre'].slug], 'category': state['category'].slug,
+    }
+
+
+# (имя маршрута, метод): функция, возвращающая по созданным данным
+# аргументы URL и тело запроса.
+ENDPOINT_REQUESTS = {
+    ('api-root', 'get'): lambda state: ({}, None),
+    ('signup', 'post'): lambda state: (
+        {}, {'username': 'newbie', 'email': 'newbie@yamdb.fake'}),
+    ('obtain_token', 'post'): lambda state: ({}, {
+        'username': state['users']['user'].username,
+        'confirmation_code': default_token_generator.make_token(
+            state['users']['user']),
+    }),
+    ('update_user', 'get'): lambda state: ({}, None),
+    ('update_user', 'patch'): lambda state: ({}, {'bio': 'Новая биография'}),
+    ('admin_create_user_list', 'get'): lambda state: ({}, None),
+    ('admin_create_user_list', 'post'): lambda state: (
+        {}, {'username': 'newbie', 'email': 'newbie@yamdb.fake'}),
+    ('user_detail', 'get'): lambda state: (
+        {'username': state['users']['moderator'].username}, None),
+    ('user_detail', 'patch'): lambda state: (
+        {'username': state['users']['moderator'].username},
+        {'bio': 'Новая биография'}),
+    ('user_detail', 'delete'): lambda state: (
+        {'username': state['users']['moderator'].username}, None),
+    ('genres-list', 'get'): lambda state: ({}, None),
+    ('genres-list', 'post'): lambda state: (
+        {}, {'name': 'Новый жанр', 'slug': 'new-genre'}),
+    ('genres-delete-by-slug', 'delete'): lambda state: (
+        {'slug': state['genre'].slug}, None),
+    # Маршрут DELETE /genres/{pk}/ перекрыт удалением по slug.
+    ('genres-detail', 'delete'): lambda state: (
+        {'pk': state['genre'].slug}, None),
+    ('categories-list', 'get'): lambda state: ({}, None),
+    ('categories-list', 'post'): lambda state: (
+        {}, {'name': 'Новая категория', 'slug': 'new-category'}),
+    ('categories-delete-by-slug', 'delete'): lambda state: (
+        {'slug': state['category'].slug}, None),
+    ('categories-detail', 'delete'): lambda state: (
+        {'pk': state['category'].slug}, None),
+    ('titles-list', 'get'): lambda state: ({}, None),
+    ('titles-list', 'post'): lambda state: ({}, title_data(state)),
+    ('titles-bulk', 'post'): lambda state: ({}, [title_data(state)]),
+    ('titles-detail', 'get'): lambda state: (
+        {'pk': state['title'].id}, None),
+    ('titles-detail', 'patch'): lambda state: (
+        {'pk': state['title'].id}, {'name': 'Новое название'}),
+    ('titles-detail', 'delete'): lambda state: (
+        {'pk': state['title'].id}, None),
+    ('reviews-list', 'get'): lambda state: (
+        {'title_id': state['title'].id}, None),
+    ('reviews-list', 'post'): lambda state: (
+        {'title_id': state['title'].id}, {'text': 'Отзыв', 'score': 7}),
+    ('reviews-detail', 'get'): lambda state: (
+        {'title_id': state['title'].id, 'pk': state['review'].id}, None),
+    ('reviews-detail', 'patch'): lambda state: (
+        {'title_id': state['title'].id, 'pk': state['review'].id},
+        {'text': 'Новый текст'}),
+    ('reviews-detail', 'delete'): lambda state: (
+        {'title_id': state['title'].id, 'pk': state['review'].id}, None),
+    ('comments-list', 'get'): lambda state: (
+        {'title_id': state['title'].id, 'review_id': state['review'].id},
+        None),
+    ('comments-list', 'post'): lambda state: (
+        {'title_id': state['title'].id, 'review_id': state['review'].id},
+        {'text': 'Комментарий'}),
+    ('comments-detail', 'get'): lambda state: (
+        {'title_id': state['title'].id, 'review_id': state['review'].id,
+         'pk': state['comment'].id}, None),
+    ('comments-detail', 'patch'): lambda state: (
+        {'title_id': state['title'].id, 'review_id': state['review'].id,
+         'pk': state['comment'].id}, {'text': 'Новый текст'}),
+    ('comments-detail', 'delete'): lambda state: (
+        {'title_id': state['title'].id, 'review_id': state['review'].id,
+         'pk': state['comment'].id}, None),
+    ('async_titles', 'get'): lambda state: ({}, None),
+    ('async_title_detail', 'get'): lambda state: (
+        {'title_id': state['title'].id}, None),
+    ('async_reviews', 'get'): lambda state: (
+        {'title_id': state['title'].id}, None),
+    ('async_comments', 'get'): lambda state: (
+        {'title_id': state['title'].id, 'review_id': state['review'].id},
+        None),
+}
+
+
+class QueryCounter:
+    """Счетчик SQL-запросов соединений, в которые он установлен."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """
+    Подсчет запросов текущего потока и пула асинхронных представлений.
+
+    Асинхронные представления работают с базой в потоках своего пула,
+    поэтому на время подсчета пул заменяется одним потоком, соединение
+    которого тоже передает запросы счетчику.
+    """
+    counter = QueryCounter()
+
+    def install_counter():
+        # Запросы настройки нового соединения не относятся к запросу API.
+        connection.ensure_connection()
+        connection.execute_wrappers.append(counter)
+
+    def close_connection():
+        connection.close()
+
+    executor = ThreadPoolExecutor(
+        max_workers=1, initializer=install_counter)
+    original_executor, async_views.executor = async_views.executor, executor
+    try:
+        with connection.execute_wrapper(counter):
+            yield counter
+    finally:
+        async_views.executor = original_executor
+        executor.submit(close_connection).result()
+        executor.shutdown()
+
+
+def populate(size):
+    """
+    Данные, в которых каждый список эндпоинтов содержит size объектов.
+
+    Отзыв и комментарий, с которыми работают запросы к отдельным
+    объектам, принадлежат пользователю с ролью `user`.
+    """
+    users = {
+        role: CustomUser.objects.create(
+            username=f'budget-{role}', email=f'budget-{role}@yamdb.fake',
+            role=role)
+        for role in ROLES
+    }
+    authors = [users['user']] + [
+        CustomUser.objects.create(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+        for idx in range(1, size)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(size)
+    ]
+    categories = [
+        Category.objects.create(
+            name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(size)
+    ]
+    titles = []
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000,
+            category=categories[idx])
+        TitleGenre.objects.create(title=title, genre=genres[idx])
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=5)
+        for author in authors
+    ]
+    comments = [
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий')
+        for author in authors
+    ]
+    return {
+        'users': users, 'genre': genres[0], 'category': categories[0],
+        'title': titles[0], 'review': reviews[0], 'comment': comments[0],
+    }
+
+
+@pytest.fixture
+def replay_endpoint():
+    """
+    Фикстура повтора запроса к эндпоинту на данных заданного размера.
+
+    Возвращает функцию (имя маршрута, метод, роль, размер), которая
+    очищает базу и кэш, создает данные и возвращает число SQL-запросов,
+    выполненных при обработке запроса.
+    """
+    def replay(name, method, role, size):
+        call_command('flush', interactive=False, verbosity=0)
+        cache.clear()
+        state = populate(size)
+        client = APIClient()
+        if role != 'anon':
+            client.credentials(HTTP_AUTHORIZATION=(
+                f'Bearer {RoleAccessToken.for_user(state["users"][role])}'))
+        kwargs, data = ENDPOINT_REQUESTS[name, method](state)
+        url = reverse(name, kwargs=kwargs)
+        with count_queries() as counter:
+            response = getattr(client, method)(url, data=data, format='json')
+        assert response.status_code < 400, (
+            f'Запрос {method.upper()} {url} от роли `{role}` завершился '
+            f'ошибкой {response.status_code}: {response.content[:200]}'
+        )
+        return len(counter.queries)
+
+    return replay
@@ -0,0 +1,47 @@
+# Наибольшее число SQL-запросов на один запрос к эндпоинту API v1:
+# (имя маршрута, метод, роль) -> бюджет. Роль `anon` - запрос без токена.
+# Бюджет проверяется на списках из 1 и 50 объектов, и число запросов не
+# должно расти с размером списка (см. test_26_query_budgets.py).
+QUERY_BUDGETS = {
+    ('api-root', 'get', 'anon'): 0,
+    ('signup', 'post', 'anon'): 12,
+    ('obtain_token', 'post', 'anon'): 1,
+    ('update_user', 'get', 'user'): 1,
+    ('update_user', 'patch', 'user'): 2,
+    ('admin_create_user_list', 'get', 'admin'): 2,
+    ('admin_create_user_list', 'post', 'admin'): 3,
+    ('user_detail', 'get', 'admin'): 1,
+    ('user_detail', 'patch', 'admin'): 2,
+    ('user_detail', 'delete', 'admin'): 8,
+    ('genres-list', 'get', 'anon'): 2,
+    ('genres-list', 'post', 'admin'): 2,
+    ('genres-delete-by-slug', 'delete', 'admin'): 5,
+    ('genres-detail', 'delete', 'admin'): 5,
+    ('categories-list', 'get', 'anon'): 2,
+    ('categories-list', 'post', 'admin'): 2,
+    ('categories-delete-by-slug', 'delete', 'admin'): 5,
+    ('categories-detail', 'delete', 'admin'): 5,
+    ('titles-list', 'get', 'anon'): 5,
+    # Два запроса проверяют жанры и категорию из реестра по базе.
+    ('titles-list', 'post', 'admin'): 10,
+    ('titles-bulk', 'post', 'admin'): 6,
+    ('titles-detail', 'get', 'anon'): 4,
+    ('titles-detail', 'patch', 'admin'): 5,
+    ('titles-detail', 'delete', 'admin'): 10,
+    ('reviews-list', 'get', 'anon'): 3,
+    ('reviews-list', 'post', 'moderator'): 4,
+    ('reviews-detail', 'get', 'anon'): 2,
+    ('reviews-detail', 'patch', 'user'): 4,
+    ('reviews-detail', 'patch', 'moderator'): 4,
+    ('reviews-detail', 'delete', 'user'): 7,
+    ('reviews-detail', 'delete', 'admin'): 7,
+    ('comments-list', 'get', 'anon'): 3,
+    ('comments-list', 'post', 'user'): 2,
+    ('comments-detail', 'get', 'anon'): 2,
+    ('comments-detail', 'patch', 'user'): 3,
+    ('comments-detail', 'delete', 'moderator'): 4,
+    ('async_titles', 'get', 'anon'): 5,
+    ('async_title_detail', 'get', 'anon'): 4,
+    ('async_reviews', 'get', 'anon'): 3,
+    ('async_comments', 'get', 'anon'): 3,
+}
@@ -0,0 +1,159 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Review, Title
+from users.models import CustomUser
+
+
+def rating_state(title):
+    title.refresh_from_db()
+    return title.score_sum, title.review_count, title.rating
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    return [
+        Title.objects.create(name=f'Произведение {idx}', year=2000,
+                             category=category)
+        for idx in range(2)
+    ]
+
+
+@pytest.fixture
+def authors():
+    return [
+        CustomUser.objects.create(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+        for idx in range(3)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def test_01_create(self, titles, authors):
+        assert rating_state(titles[0]) == (0, 0, None), (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+        for author, score in zip(authors, (4, 7, 10)):
+            Review.objects.create(
+                title=titles[0], author=author, text='Отзыв', score=score)
+        assert rating_state(titles[0]) == (21, 3, 7), (
+            'Проверьте, что создание отзыва обновляет рейтинг произведения'
+        )
+
+    def test_02_change_score_and_title(self, titles, authors):
+        review = Review.objects.create(
+            title=titles[0], author=authors[0], text='Отзыв', score=4)
+        Review.objects.create(
+            title=titles[0], author=authors[1], text='Отзыв', score=8)
+        review.score = 10
+        review.save()
+        assert rating_state(titles[0]) == (18, 2, 9), (
+            'Проверьте, что изменение оценки обновляет рейтинг произведения'
+        )
+        review = Review.objects.get(id=review.id)
+        review.title = titles[1]
+        review.save()
+        assert rating_state(titles[0]) == (8, 1, 8), (
+            'Проверьте, что перенос отзыва обновляет рейтинг прежнего '
+            'произведения'
+        )
+        assert rating_state(titles[1]) == (10, 1, 10), (
+            'Проверьте, что перенос отзыва обновляет рейтинг нового '
+            'произведения'
+        )
+
+    def test_03_delete(self, titles, authors):
+        review = Review.objects.create(
+            title=titles[0], author=authors[0], text='Отзыв', score=4)
+        Review.objects.create(
+            title=titles[0], author=authors[1], text='Отзыв', score=8)
+        Review.objects.get(id=review.id).delete()
+        assert rating_state(titles[0]) == (8, 1, 8), (
+            'Проверьте, что удаление отзыва обновляет рейтинг произведения'
+        )
+
+    def test_04_deferred_fields(self, titles, authors):
+        reviews = [
+            Review.objects.create(
+                title=titles[0], author=author, text='Отзыв', score=score)
+            for author, score in zip(authors, (4, 6, 8))
+        ]
+        review = Review.objects.only('id', 'text').get(id=reviews[0].id)
+        review.text = 'Новый текст'
+        review.save()
+        assert rating_state(titles[0]) == (18, 3, 6), (
+            'Проверьте, что сохранение отзыва с отложенной оценкой не '
+            'меняет рейтинг'
+        )
+        review = Review.objects.only('id', 'score').get(id=reviews[1].id)
+        review.title = titles[1]
+        review.save()
+        assert (rating_state(titles[0]), rating_state(titles[1])) == (
+            (12, 2, 6), (6, 1, 6)), (
+            'Проверьте, что перенос отзыва с отложенным произведением '
+            'обновляет рейтинги обоих произведений'
+        )
+        Review.objects.only('id').get(id=reviews[2].id).delete()
+        assert rating_state(titles[0]) == (4, 1, 4), (
+            'Проверьте, что удаление отзыва с отложенными полями обновляет '
+            'рейтинг произведения'
+        )
+
+    def test_05_cascade(self, titles, authors):
+        for title in titles:
+            for author, score in zip(authors, (3, 6, 9)):
+                Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score)
+        authors[0].delete()
+        assert rating_state(titles[0]) == (15, 2, 7.5), (
+            'Проверьте, что удаление автора обновляет рейтинг произведений'
+        )
+        assert rating_state(titles[1]) == (15, 2, 7.5)
+        titles[0].delete()
+        assert not Review.objects.filter(title_id=titles[0].id).exists()
+        assert rating_state(titles[1]) == (15, 2, 7.5), (
+            'Проверьте, что удаление произведения не меняет рейтинги '
+            'других произведений'
+        )
+
+    def test_06_recompute_ratings(self, titles, authors):
+        for author, score in zip(authors, (2, 4, 9)):
+            Review.objects.create(
+                title=titles[0], author=author, text='Отзыв', score=score)
+        Title.objects.filter(id=titles[0].id).update(
+            score_sum=1, review_count=7, rating=0.5)
+        Title.objects.filter(id=titles[1].id).update(
+            score_sum=3, review_count=1, rating=3)
+        call_command('recompute_ratings', batch_size=1, verbosity=0)
+        assert rating_state(titles[0]) == (15, 3, 5), (
+            'Проверьте, что recompute_ratings исправляет расхождения '
+            'рейтинга'
+        )
+        assert rating_state(titles[1]) == (0, 0, None), (
+            'Проверьте, что recompute_ratings сбрасывает рейтинг '
+            'произведения без отзывов'
+        )
+
+    def test_07_delete_with_drifted_totals(self, titles, authors):
+        reviews = [
+            Review.objects.create(
+                title=titles[0], author=author, text='Отзыв', score=score)
+            for author, score in zip(authors, (3, 6, 9))
+        ]
+        Title.objects.filter(id=titles[0].id).update(
+            score_sum=0, review_count=0, rating=None)
+        reviews[0].delete()
+        assert rating_state(titles[0]) == (15, 2, 7.5), (
+            'Проверьте, что удаление отзыва при разошедшихся суммах '
+            'пересчитывает рейтинг, а не нарушает ограничения'
+        )
+        Title.objects.filter(id=titles[0].id).update(score_sum=1)
+        reviews[1].score = 1
+        reviews[1].save()
+        assert rating_state(titles[0]) == (10, 2, 5), (
+            'Проверьте, что уменьшение оценки при разошедшихся суммах '
+            'пересчитывает рейтинг'
+        )
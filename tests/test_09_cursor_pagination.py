@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPaginationAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def collect_pages(self, client, url):
+        results = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` в курсорном режиме '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации ответ не '
+                'содержит ключ `count`.'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    def test_01_titles_cursor(self, client, admin_client):
+        create_titles(admin_client)
+        for idx in range(6):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'category': 'films',
+            })
+        results = self.collect_pages(client, f'{self.TITLES_URL}?cursor=')
+        ids = [title['id'] for title in results]
+        assert len(ids) == 8 and ids == sorted(ids), (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения по возрастанию `id` без повторов.'
+        )
+
+        response = client.get(self.TITLES_URL)
+        assert response.json().get('count') == 8, (
+            f'Проверьте, что без параметра `cursor` эндпоинт '
+            f'`{self.TITLES_URL}` использует постраничную пагинацию.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client, admin,
+                               user_client, user, moderator_client,
+                               moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(f'{url}?cursor=')
+        data = response.json()
+        assert data['next'] is None and len(data['results']) == 3, (
+            f'Проверьте, что курсорная пагинация `{url}` возвращает все '
+            'отзывы произведения.'
+        )
+        expected_ids = [review['id'] for review in reversed(reviews)]
+        assert [
+            review['id'] for review in data['results']
+        ] == expected_ids, (
+            f'Проверьте, что курсорная пагинация `{url}` сортирует отзывы '
+            'от новых к старым.'
+        )
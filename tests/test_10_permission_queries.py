@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def count_user_queries(queries):
+    return sum(
+        1 for query in queries if 'users_customuser' in query['sql']
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10PermissionQueries:
+
+    def check_authorization_queries(self, client, method, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(url, data=data)
+        assert response.status_code < HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что {method.upper()}-запрос администратора к '
+            f'`{url}` выполняется успешно.'
+        )
+        assert count_user_queries(context.captured_queries) <= 1, (
+            f'Проверьте, что при {method.upper()}-запросе к `{url}` '
+            'проверка роли пользователя не выполняет дополнительных '
+            'запросов к базе данных сверх аутентификации.'
+        )
+
+    def test_01_admin_writes(self, admin_client):
+        self.check_authorization_queries(
+            admin_client, 'post', '/api/v1/genres/',
+            {'name': 'Ужасы', 'slug': 'horror'}
+        )
+        self.check_authorization_queries(
+            admin_client, 'delete', '/api/v1/genres/horror/'
+        )
+        titles, _, _ = create_titles(admin_client)
+        self.check_authorization_queries(
+            admin_client, 'patch', f'/api/v1/titles/{titles[0]["id"]}/',
+            {'name': 'Новое название'}
+        )
+        self.check_authorization_queries(
+            admin_client, 'delete', f'/api/v1/titles/{titles[1]["id"]}/'
+        )
+
+    def test_02_role_change_is_visible(self, admin_client, user,
+                                       user_client):
+        response = user_client.post(
+            '/api/v1/genres/', data={'name': 'Ужасы', 'slug': 'horror'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пользователь с ролью `user` не может создавать '
+            'жанры.'
+        )
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.post(
+            '/api/v1/genres/', data={'name': 'Ужасы', 'slug': 'horror'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после смены роли пользователя администратором '
+            'новая роль сразу учитывается при проверке разрешений.'
+        )
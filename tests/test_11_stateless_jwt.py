@@ -0,0 +1,163 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import create_titles
+from users.models import CustomUser
+
+
+def get_token_client(user):
+    response = APIClient().post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK, (
+        'Проверьте, что POST-запрос к `/api/v1/auth/token/` с корректным '
+        'кодом подтверждения возвращает ответ со статусом 200.'
+    )
+    token = response.json()['token']
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client, AccessToken(token)
+
+
+def count_user_queries(queries):
+    return sum(
+        1 for query in queries if 'users_customuser' in query['sql']
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11StatelessJWT:
+
+    def test_01_token_claims(self, admin):
+        _, token = get_token_client(admin)
+        for claim, value in (
+                ('username', admin.username),
+                ('role', admin.role),
+                ('is_superuser', admin.is_superuser)):
+            assert token.get(claim) == value, (
+                'Проверьте, что токен, выдаваемый по адресу '
+                f'`/api/v1/auth/token/`, содержит поле `{claim}`.'
+            )
+
+    def test_02_no_user_queries(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client, _ = get_token_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос пользователя к `{url}` с токеном '
+            'без обращения к базе возвращает ответ со статусом 201.'
+        )
+        assert response.json()['author'] == user.username, (
+            f'Проверьте, что POST-запрос пользователя к `{url}` сохраняет '
+            'автора отзыва.'
+        )
+        assert count_user_queries(context.captured_queries) == 0, (
+            'Проверьте, что аутентификация по токену с данными о роли не '
+            'загружает пользователя из базы данных.'
+        )
+
+    def test_03_profile_loads_from_db(self, user):
+        client, _ = get_token_client(user)
+        response = client.patch('/api/v1/users/me/', data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что PATCH-запрос к `/api/v1/users/me/` с токеном '
+            'без обращения к базе возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['bio'] == 'Новое' and data['email'] == user.email, (
+            'Проверьте, что профиль пользователя обновляется по полной '
+            'записи из базы данных.'
+        )
+
+    def test_04_role_change_invalidates_claims(self, admin_client, user):
+        client, _ = get_token_client(user)
+        genre = {'name': 'Ужасы', 'slug': 'horror'}
+        response = client.post('/api/v1/genres/', data=genre)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пользователь с ролью `user` не может создавать '
+            'жанры.'
+        )
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = client.post('/api/v1/genres/', data=genre)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после смены роли данные о роли в ранее '
+            'выпущенном токене не используются.'
+        )
+
+    def test_05_deactivation_revokes_token(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client, _ = get_token_client(user)
+        user.is_active = False
+        user.save()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен заблокированного пользователя перестает '
+            'действовать.'
+        )
+        response = APIClient().post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что заблокированный пользователь не получает токен.'
+        )
+
+    def test_06_orm_deletion_revokes_token(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client, _ = get_token_client(user)
+        CustomUser.objects.filter(id=user.id).delete()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен пользователя, удаленного через ORM, '
+            'перестает действовать.'
+        )
+
+    def test_07_admin_site_role_change(self, user, user_superuser):
+        client, _ = get_token_client(user)
+        genre = {'name': 'Ужасы', 'slug': 'horror'}
+        site_client = Client()
+        site_client.force_login(user_superuser)
+        response = site_client.post(
+            f'/admin/users/customuser/{user.id}/change/', data={
+                'username': user.username, 'email': user.email,
+                'first_name': '', 'last_name': '', 'bio': '',
+                'role': 'admin', 'is_active': 'on',
+                'date_joined_0': '2024-01-01', 'date_joined_1': '00:00:00',
+            })
+        assert response.status_code == HTTPStatus.FOUND, (
+            'Проверьте, что роль пользователя меняется через админку.'
+        )
+        response = client.post('/api/v1/genres/', data=genre)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после смены роли через админку данные о роли '
+            'в ранее выпущенном токене не используются.'
+        )
+
+    def test_08_shared_revocation(self, user):
+        client, _ = get_token_client(user)
+        # Другой процесс с пустым кэшем узнает об отзыве из базы.
+        CustomUser.objects.filter(id=user.id).update(
+            role='admin', claims_changed_at=timezone.now())
+        cache.clear()
+        response = client.post(
+            '/api/v1/genres/', data={'name': 'Ужасы', 'slug': 'horror'})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что отзыв данных в токенах хранится в базе и '
+            'виден процессам без общего кэша.'
+        )
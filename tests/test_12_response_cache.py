@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    def get_without_queries(self, client, url):
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert len(context.captured_queries) == 0, (
+            f'Проверьте, что повторный GET-запрос к `{url}` обслуживается '
+            'из кэша без запросов к базе данных.'
+        )
+        return response.json()
+
+    def test_01_catalog_cached(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for url in ('/api/v1/genres/', '/api/v1/categories/',
+                    '/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/'):
+            self.get_without_queries(client, url)
+
+    def test_02_invalidation(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/genres/'
+        data = self.get_without_queries(client, url)
+        admin_client.post(url, data={'name': 'Фэнтези', 'slug': 'fantasy'})
+        assert client.get(url).json()['count'] == data['count'] + 1, (
+            f'Проверьте, что после создания жанра ответ `{url}` из кэша '
+            'становится недействительным.'
+        )
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert self.get_without_queries(client, url)['rating'] is None
+        create_single_review(user_client, titles[0]['id'], 'Текст', 7)
+        assert client.get(url).json()['rating'] == 7, (
+            f'Проверьте, что после добавления отзыва ответ `{url}` из кэша '
+            'становится недействительным и рейтинг обновляется.'
+        )
+
+        admin_client.patch(url, data={'genre': ['drama']})
+        genres = [genre['slug'] for genre in client.get(url).json()['genre']]
+        assert genres == ['drama'], (
+            f'Проверьте, что после изменения жанров произведения ответ '
+            f'`{url}` из кэша становится недействительным.'
+        )
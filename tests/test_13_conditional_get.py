@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.utils.http import http_date
+
+from reviews.versions import MODIFIED_KEY
+from tests.utils import create_comments
+from users.models import CustomUser
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=client.get(url)['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с `If-Modified-Since` '
+            'не раньше времени изменения возвращает ответ со статусом 304.'
+        )
+        return etag
+
+    def test_01_conditional_get(self, client, admin_client, admin, user,
+                                user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/comments/',
+        )
+        etags = {url: self.check_not_modified(client, url) for url in urls}
+
+        user_client.patch(
+            f'{urls[2]}{reviews[1]["id"]}/', data={'text': 'Новый текст'}
+        )
+        admin_client.patch(
+            f'{urls[3]}{comments[0]["id"]}/', data={'text': 'Новый текст'}
+        )
+        for url in urls[2:]:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения данных GET-запрос к '
+                f'`{url}` со старым `If-None-Match` возвращает ответ со '
+                'статусом 200.'
+            )
+
+    def test_02_missing_resource(self, client, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        future = http_date(2 ** 31)
+        urls = (
+            '/api/v1/titles/424242/',
+            '/api/v1/titles/424242/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/424242/comments/',
+        )
+        for url in urls:
+            response = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=future, HTTP_IF_NONE_MATCH='*')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что условный GET-запрос к `{url}` для '
+                'несуществующего объекта возвращает ответ со статусом 404.'
+            )
+        assert cache.get(MODIFIED_KEY.format('reviews.review:424242')) is None, (
+            'Проверьте, что запрос к несуществующему объекту не создает '
+            'записей в кэше.'
+        )
+
+    def test_03_author_scoped_validators(self, client, admin_client, admin,
+                                         user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'})
+        stranger = CustomUser.objects.get(username='newbie')
+        stranger.bio = 'Биография'
+        stranger.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что регистрация и изменение профиля пользователя '
+            'без отзывов не меняют ETag списка отзывов.'
+        )
+        author = CustomUser.objects.get(id=user.id)
+        author.username = 'renamed'
+        author.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена имени автора отзыва меняет ETag списка '
+            'отзывов.'
+        )
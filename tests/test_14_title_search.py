@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from tests.utils import create_titles
+
+SEARCH_TRIGGERS = {
+    'reviews_title_search_insert', 'reviews_title_search_delete',
+    'reviews_title_search_update',
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleSearch:
+    url = '/api/v1/titles/'
+
+    def search(self, client, query, **params):
+        response = client.get(self.url, data={'search': query, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = {
+            'name': 'Возвращение',
+            'year': 1990,
+            'genre': titles[0]['genre'],
+            'category': titles[0]['category'],
+            'description': 'Снова терминатор',
+        }
+        response = admin_client.post(self.url, data=data)
+        extra_id = response.json()['id']
+
+        assert self.search(client, 'терминатор') == [
+            titles[0]['id'], extra_id], (
+            'Проверьте, что поиск по `search` находит произведения по '
+            'названию и описанию без учета регистра и сортирует их по '
+            'релевантности: совпадение в названии важнее описания.'
+        )
+        assert self.search(client, 'терм', year=1990) == [extra_id], (
+            'Проверьте, что `search` ищет по началу слова и сочетается с '
+            'остальными фильтрами произведений.'
+        )
+        assert self.search(client, 'орешек "AND (') == [], (
+            'Проверьте, что спецсимволы в `search` не приводят к ошибке.'
+        )
+
+        admin_client.patch(
+            f'{self.url}{titles[1]["id"]}/', data={'name': 'Крепкий орех'}
+        )
+        admin_client.delete(f'{self.url}{titles[0]["id"]}/')
+        assert self.search(client, 'орех') == [titles[1]['id']], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        assert self.search(client, 'терминатор') == [extra_id], (
+            'Проверьте, что поисковый индекс обновляется при удалении '
+            'произведения.'
+        )
+
+    def test_02_triggers_after_migrate(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'reviews_title'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        assert SEARCH_TRIGGERS <= triggers, (
+            'Проверьте, что после всех миграций триггеры поискового индекса '
+            'на reviews_title существуют: пересоздание таблицы схемой '
+            'SQLite удаляет их.'
+        )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from api.v1.filters import TitleFilter
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return ' | '.join(row[-1] for row in cursor.fetchall())
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFilters:
+    url = '/api/v1/titles/'
+
+    def filter_ids(self, client, **params):
+        response = client.get(self.url, data=params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с фильтрами '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        ids = [title['id'] for title in data['results']]
+        assert data['count'] == len(ids) == len(set(ids)), (
+            'Проверьте, что фильтрация по жанрам не дублирует '
+            'произведения и не завышает `count`.'
+        )
+        return ids
+
+    def test_01_multi_value_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        genre_slugs = ','.join(genre['slug'] for genre in genres[:3])
+
+        assert self.filter_ids(client, genre=genre_slugs) == [
+            first, second], (
+            'Проверьте, что `genre` со списком slug через запятую '
+            'возвращает произведения с любым из указанных жанров.'
+        )
+        assert self.filter_ids(
+            client, genre=f'{genres[0]["slug"]},{genres[1]["slug"]}',
+            genre_match='all'
+        ) == [first], (
+            'Проверьте, что при `genre_match=all` возвращаются только '
+            'произведения со всеми указанными жанрами.'
+        )
+        assert self.filter_ids(
+            client, genre=f'{genres[0]["slug"]},unknown', genre_match='all'
+        ) == [], (
+            'Проверьте, что при `genre_match=all` с несуществующим жанром '
+            'возвращается пустой список.'
+        )
+        assert self.filter_ids(
+            client, category=f'{categories[1]["slug"]},unknown'
+        ) == [second], (
+            'Проверьте, что `category` принимает список slug через запятую.'
+        )
+        assert self.filter_ids(
+            client, genre=genres[0]['slug'][:-1]) == [], (
+            'Проверьте, что фильтр `genre` требует точного совпадения slug.'
+        )
+        for value in ('', ',', ',,'):
+            assert self.filter_ids(client, genre=value) == [
+                first, second], (
+                f'Проверьте, что `genre={value}` без slug не фильтрует '
+                'произведения.'
+            )
+        assert self.filter_ids(
+            client, genre=f',{genres[2]["slug"]},') == [second], (
+            'Проверьте, что пустые значения в списке `genre` пропускаются.'
+        )
+        response = client.get(self.url, data={'genre_match': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что недопустимое значение `genre_match` '
+            'возвращает ответ со статусом 400.'
+        )
+
+    def test_02_filters_query_plan(self, admin_client):
+        create_titles(admin_client)
+        for genre_match in ('any', 'all'):
+            queryset = TitleFilter(
+                {'genre': 'horror,comedy', 'genre_match': genre_match},
+                Title.objects.all()
+            ).qs
+            plan = query_plan(queryset)
+            assert 'titlegenre_genre_title_idx' in plan, (
+                'Проверьте, что фильтр по жанрам использует индекс '
+                f'`titlegenre_genre_title_idx`. План запроса: {plan}'
+            )
+            assert 'SCAN reviews_titlegenre' not in plan, (
+                'Проверьте, что фильтр по жанрам не сканирует таблицу '
+                f'`reviews_titlegenre` целиком. План запроса: {plan}'
+            )
+        queryset = TitleFilter(
+            {'category': 'films,books'}, Title.objects.all()).qs
+        plan = query_plan(queryset)
+        assert 'reviews_title_category_id' in plan, (
+            'Проверьте, что фильтр по категориям использует индекс по '
+            f'`category_id`. План запроса: {plan}'
+        )
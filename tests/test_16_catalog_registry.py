@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre
+from reviews.registry import _registries, get_by_slug, get_registry
+from reviews.versions import get_versions
+from tests.utils import create_titles
+
+
+def catalog_queries(context, marker='FROM'):
+    return [
+        query['sql'] for query in context.captured_queries
+        if f'{marker} "reviews_genre"' in query['sql']
+        or f'{marker} "reviews_category"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16CatalogRegistry:
+    url = '/api/v1/titles/'
+
+    def test_01_titles_without_catalog_queries(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url, data={'year': titles[0]['year']})
+        assert response.status_code == HTTPStatus.OK
+        title = response.json()['results'][0]
+        assert title['category'] == categories[0] and sorted(
+            title['genre'], key=lambda genre: genre['name']
+        ) == title['genre'] and len(title['genre']) == 2, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает '
+            'категорию и жанры произведения.'
+        )
+        assert not catalog_queries(context), (
+            f'Проверьте, что при GET-запросе к `{self.url}` жанры и '
+            'категории берутся из локального реестра, а не из базы.'
+        )
+
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[1]['slug'],
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not catalog_queries(context, marker='ORDER BY'), (
+            f'Проверьте, что при POST-запросе к `{self.url}` slug жанров и '
+            'категории проверяются по локальному реестру.'
+        )
+        assert len(catalog_queries(context, marker='WHERE')) == 2, (
+            f'Проверьте, что при POST-запросе к `{self.url}` существование '
+            'жанров и категории проверяется одним запросом на модель.'
+        )
+
+    def test_02_registry_invalidation(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Вестерн', 'slug': 'western'})
+        admin_client.delete(f'/api/v1/categories/{categories[1]["slug"]}/')
+        data = {
+            'name': 'Хороший, плохой, злой',
+            'year': 1966,
+            'genre': ['western'],
+            'category': categories[0]['slug'],
+        }
+        response = admin_client.post(self.url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что новый жанр сразу доступен при создании '
+            'произведения.'
+        )
+        data['category'] = categories[1]['slug']
+        response = admin_client.post(self.url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что удаленная категория не принимается при создании '
+            'произведения.'
+        )
+
+    def test_03_stale_registry(self, client, admin_client, settings):
+        _, categories, genres = create_titles(admin_client)
+        # Реестр другого процесса: версия в кэше процесса не меняется.
+        category_registry = get_registry(Category)
+        Category.objects.filter(slug=categories[1]['slug']).delete()
+        _registries[Category] = category_registry._replace(
+            version=get_versions(Category)[0])
+        data = {
+            'name': 'Хороший, плохой, злой',
+            'year': 1966,
+            'genre': [genres[0]['slug']],
+            'category': categories[1]['slug'],
+        }
+        response = admin_client.post(self.url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что категория, удаленная в другом процессе, не '
+            'принимается при создании произведения.'
+        )
+        assert 'category' in response.json()
+
+        genre_registry = get_registry(Genre)
+        Genre.objects.filter(slug=genres[0]['slug']).update(name='Другое')
+        _registries[Genre] = genre_registry._replace(
+            version=get_versions(Genre)[0])
+        settings.CATALOG_REGISTRY_MAX_AGE = 0
+        assert get_by_slug(Genre, genres[0]['slug']).name == 'Другое', (
+            'Проверьте, что реестр перечитывается по истечении '
+            'CATALOG_REGISTRY_MAX_AGE.'
+        )
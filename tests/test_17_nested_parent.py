@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+def parent_queries(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}" ' in query['sql']
+        and f'"{table}"."id" = ' in query['sql'].split('WHERE')[-1]
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17NestedParent:
+
+    def test_01_single_parent_query(self, admin_client, admin, user,
+                                    user_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Ок', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(parent_queries(context, 'reviews_title')) == 1, (
+            f'Проверьте, что POST-запрос к `{url}` загружает произведение '
+            'из URL один раз.'
+        )
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(parent_queries(context, 'reviews_review')) == 1, (
+            f'Проверьте, что POST-запрос к `{url}` загружает отзыв из URL '
+            'один раз.'
+        )
+
+    def test_02_parent_chain_validation(self, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = (f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{url}` с отзывом, не относящимся '
+            'к произведению из URL, возвращает ответ со статусом 404.'
+        )
+        response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что POST-запрос к `{url}` с отзывом, не относящимся '
+            'к произведению из URL, возвращает ответ со статусом 404.'
+        )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.nplusone import NPlusOneDetector, NPlusOneError
+from reviews.models import Comment, Review, Title
+from users.models import CustomUser
+
+
+def create_authors(count):
+    return [
+        CustomUser.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+        for idx in range(count)
+    ]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+        'статусом 200.'
+    )
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18NPlusOne:
+
+    @pytest.fixture(autouse=True)
+    def detect_n_plus_one(self, settings):
+        settings.DEBUG = True
+        settings.N_PLUS_ONE_RAISE = True
+
+    def test_01_list_queries_do_not_grow(self, client):
+        authors = create_authors(5)
+        title = Title.objects.create(name='Солярис', year=1972)
+        review = Review.objects.create(
+            title=title, author=authors[0], text='Отзыв', score=8)
+        Comment.objects.create(review=review, author=authors[0], text='Да')
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        single = {
+            url: count_queries(client, url)
+            for url in (reviews_url, comments_url)
+        }
+
+        for author in authors[1:]:
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=6)
+            Comment.objects.create(review=review, author=author, text='Нет')
+        for url, expected in single.items():
+            assert count_queries(client, url) == expected, (
+                f'Проверьте, что число запросов к базе при GET-запросе к '
+                f'`{url}` не растет вместе с размером страницы.'
+            )
+
+    def test_02_detector(self):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        for author in create_authors(5):
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=9)
+        with NPlusOneDetector() as detector:
+            [review.author.username for review in Review.objects.all()]
+        with pytest.raises(NPlusOneError):
+            detector.check()
@@ -0,0 +1,56 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import connections
+from rest_framework.test import APIClient
+
+from reviews.models import Review, Title
+
+THREADS = 5
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ConcurrentReviews:
+
+    def test_01_parallel_duplicate_reviews(self, user, token_user):
+        title = Title.objects.create(name='Зеркало', year=1975)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        barrier = threading.Barrier(THREADS)
+        results = []
+
+        def post_review(idx):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}')
+            try:
+                barrier.wait()
+                response = client.post(
+                    url, data={'text': f'Отзыв {idx}', 'score': 8})
+                results.append(response.status_code)
+            except Exception as error:
+                results.append(repr(error))
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=post_review, args=(idx,))
+            for idx in range(THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == [HTTPStatus.CREATED] + [
+            HTTPStatus.BAD_REQUEST] * (THREADS - 1), (
+            'Проверьте, что из параллельных POST-запросов одного автора к '
+            f'`{url}` успешен ровно один, а остальные возвращают ответ со '
+            f'статусом 400. Получены статусы: {results}'
+        )
+        assert Review.objects.filter(title=title, author=user).count() == 1
+        title.refresh_from_db()
+        assert title.review_count == 1 and title.score_sum == 8, (
+            'Проверьте, что отклоненные повторные отзывы не меняют рейтинг '
+            'произведения.'
+        )
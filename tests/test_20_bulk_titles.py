@@ -0,0 +1,95 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20BulkTitles:
+    url = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_json(self, admin_client, user_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        items = [
+            {
+                'name': f'Произведение {idx}', 'year': 2000 + idx,
+                'genre': [genres[0]['slug'], genres[idx % 3]['slug']],
+                'category': categories[idx % 2]['slug'],
+            }
+            for idx in range(20)
+        ]
+        items.insert(3, {'name': 'Без категории', 'year': 2001})
+        items.insert(5, {
+            'name': 'Неизвестный жанр', 'year': 2002, 'genre': ['unknown'],
+            'category': categories[0]['slug'],
+        })
+
+        response = user_client.post(self.url, data=items, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что POST-запрос к `{self.url}` доступен только '
+            'администратору.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.url, data=items, format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            f'Проверьте, что POST-запрос администратора к `{self.url}` с '
+            'частично некорректными данными возвращает ответ со статусом 207.'
+        )
+        data = response.json()
+        statuses = [result['status'] for result in data['results']]
+        assert data['created'] == 20 and data['failed'] == 2 and statuses[
+            3] == statuses[5] == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что ответ содержит результат для каждого элемента '
+            'пакета в порядке загрузки.'
+        )
+        assert 'category' in data['results'][3]['errors'] and (
+            'genre' in data['results'][5]['errors']), (
+            'Проверьте, что для некорректных элементов возвращаются ошибки '
+            'валидации.'
+        )
+        inserts = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('INSERT')
+        ]
+        assert len(inserts) == 2, (
+            'Проверьте, что произведения и их жанры вставляются через '
+            f'bulk_create. Выполнены вставки: {inserts}'
+        )
+
+        created = data['results'][6]
+        title = Title.objects.get(id=created['id'])
+        assert title.name == items[6]['name'] and sorted(
+            title.genre.values_list('slug', flat=True)
+        ) == sorted(set(items[6]['genre'])), (
+            'Проверьте, что в ответе возвращаются id созданных произведений '
+            'и их жанры сохраняются.'
+        )
+        response = admin_client.get('/api/v1/titles/')
+        assert response.json()['count'] == 20, (
+            'Проверьте, что после массовой загрузки список произведений '
+            'обновляется.'
+        )
+
+    def test_02_bulk_ndjson(self, admin_client):
+        categories = create_categories(admin_client)
+        body = '\n'.join(json.dumps({
+            'name': f'Книга {idx}', 'year': 1990 + idx,
+            'category': categories[0]['slug'],
+        }) for idx in range(3))
+        response = admin_client.post(
+            self.url, data=body, content_type='application/x-ndjson')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.url}` принимает NDJSON.'
+        )
+        assert Title.objects.count() == 3
+
+        response = admin_client.post(
+            self.url, data='{"name": ', content_type='application/x-ndjson')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
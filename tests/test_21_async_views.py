@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AsyncViews:
+
+    def test_01_async_views_match_sync(self, client, admin_client, admin,
+                                       user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        paths = (
+            'titles/',
+            f'titles/?year={titles[0]["year"]}',
+            f'titles/{title_id}/',
+            f'titles/{title_id}/reviews/',
+            f'titles/{title_id}/reviews/{reviews[0]["id"]}/comments/',
+        )
+        for path in paths:
+            sync_response = client.get(f'/api/v1/{path}')
+            async_response = client.get(f'/api/v1/async/{path}')
+            assert async_response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `/api/v1/async/{path}` '
+                'возвращает ответ со статусом 200.'
+            )
+            sync_data, async_data = sync_response.json(), async_response.json()
+            if 'results' in sync_data:
+                for data in (sync_data, async_data):
+                    for key in ('next', 'previous'):
+                        data[key] = data[key] and data[key].replace(
+                            '/async/', '/')
+            assert async_data == sync_data, (
+                f'Проверьте, что асинхронный эндпоинт `/api/v1/async/{path}` '
+                'возвращает те же данные, что и синхронный.'
+            )
+
+    def test_02_async_views_not_found(self, client, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        paths = (
+            'titles/999/',
+            'titles/999/reviews/',
+            f'titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+            'titles/?page=5',
+        )
+        for path in paths:
+            response = client.get(f'/api/v1/async/{path}')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `/api/v1/async/{path}` '
+                'возвращает ответ со статусом 404.'
+            )
+        response = admin_client.post('/api/v1/async/titles/', data={})
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
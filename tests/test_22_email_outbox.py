@@ -0,0 +1,92 @@
+import io
+from datetime import timedelta
+from http import HTTPStatus
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users import outbox
+from users.models import OutgoingEmail
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('Сервер недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22EmailOutbox:
+    url = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx):
+        response = client.post(self.url, data={
+            'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'})
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_signup_enqueues(self, client, settings):
+        settings.EMAIL_OUTBOX_DISPATCH = 'worker'
+        self.signup(client, 1)
+        assert not mail.outbox and OutgoingEmail.objects.filter(
+            sent_at__isnull=True, recipients=['user1@yamdb.fake']
+        ).exists(), (
+            f'Проверьте, что POST-запрос к `{self.url}` только ставит письмо '
+            'с кодом подтверждения в очередь исходящей почты.'
+        )
+        call_command('send_emails', stdout=io.StringIO())
+        assert len(mail.outbox) == 1 and mail.outbox[0].to == [
+            'user1@yamdb.fake'], (
+            'Проверьте, что команда `send_emails` отправляет письма из '
+            'очереди.'
+        )
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_02_retry(self, client, settings):
+        settings.EMAIL_OUTBOX_DISPATCH = 'worker'
+        settings.EMAIL_BACKEND = 'tests.test_22_email_outbox.FailingBackend'
+        self.signup(client, 2)
+        assert outbox.dispatch_pending() == (0, 1)
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and 'Сервер недоступен' in (
+            email.last_error) and email.send_after > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается для '
+            'повторной попытки.'
+        )
+        assert outbox.dispatch_pending() == (0, 0), (
+            'Проверьте, что повтор выполняется только после задержки.'
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend')
+        OutgoingEmail.objects.update(
+            send_after=timezone.now() - timedelta(seconds=1))
+        assert outbox.dispatch_pending() == (1, 0)
+        assert len(mail.outbox) == 1
+
+    def test_03_file_backend_single_connection(self, client, settings,
+                                               tmp_path):
+        settings.EMAIL_OUTBOX_DISPATCH = 'worker'
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend')
+        settings.EMAIL_FILE_PATH = str(tmp_path)
+        for idx in range(3):
+            self.signup(client, idx)
+        assert outbox.dispatch_pending() == (3, 0)
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1 and files[0].read_text().count(
+            'Subject: ') == 3, (
+            'Проверьте, что пачка писем отправляется через одно соединение '
+            'с файловым почтовым бэкендом.'
+        )
+
+    def test_04_background_thread(self, client, settings):
+        settings.EMAIL_OUTBOX_DISPATCH = 'thread'
+        self.signup(client, 4)
+        outbox._executor.submit(lambda: None).result(timeout=10)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что фоновый поток отправляет письма из очереди.'
+        )
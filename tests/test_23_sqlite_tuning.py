@@ -0,0 +1,48 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from reviews.sqlite import configure_sqlite
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SqliteTuning:
+
+    def test_01_pragmas_applied(self):
+        connection.close()
+        connection.ensure_connection()
+        assert pragma('journal_mode') == 'wal', (
+            'Проверьте, что соединение с SQLite работает в режиме WAL'
+        )
+        assert pragma('synchronous') == 1, (
+            'Проверьте, что для SQLite установлен synchronous=NORMAL'
+        )
+        assert pragma('busy_timeout') == (
+            settings.SQLITE_PRAGMAS['busy_timeout']), (
+            'Проверьте, что для SQLite установлен busy_timeout'
+        )
+        assert pragma('cache_size') == (
+            settings.SQLITE_PRAGMAS['cache_size']), (
+            'Проверьте, что для SQLite установлен cache_size'
+        )
+        assert pragma('mmap_size') == settings.SQLITE_PRAGMAS['mmap_size'], (
+            'Проверьте, что для SQLite установлен mmap_size'
+        )
+
+    def test_02_pragmas_from_settings(self, settings):
+        settings.SQLITE_PRAGMAS = {'cache_size': -1024}
+        configure_sqlite(sender=connection.__class__, connection=connection)
+        assert pragma('cache_size') == -1024, (
+            'Проверьте, что PRAGMA берутся из настройки SQLITE_PRAGMAS'
+        )
+
+    def test_03_persistent_connections(self):
+        assert settings.DATABASES['default']['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что для базы данных включены постоянные соединения'
+        )
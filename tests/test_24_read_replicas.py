@@ -0,0 +1,108 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections, router
+from rest_framework.test import APIClient
+
+from reviews.models import Genre, Review, Title
+from reviews.replicas import replica_routing, use_replica
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(transactional_db, settings, tmp_path):
+    name = str(tmp_path / 'replica.sqlite3')
+    connections.settings[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3', 'NAME': name}
+    settings.DATABASE_REPLICAS = [REPLICA]
+    settings.REPLICA_LAG_SECONDS = 0
+
+    def sync():
+        # Реплика - копия тестовой базы, снятая через backup API SQLite.
+        connections[REPLICA].close()
+        connection.ensure_connection()
+        target = sqlite3.connect(name)
+        connection.connection.backup(target)
+        target.close()
+
+    sync()
+    yield sync
+    connections[REPLICA].close()
+    del connections.settings[REPLICA]
+    if hasattr(connections._connections, REPLICA):
+        delattr(connections._connections, REPLICA)
+
+
+def genre_slugs(client):
+    response = client.get('/api/v1/genres/')
+    assert response.status_code == HTTPStatus.OK
+    return {genre['slug'] for genre in response.json()['results']}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReadReplicas:
+
+    def test_01_safe_requests_read_replica(self, replica):
+        Genre.objects.create(name='Драма', slug='drama')
+        replica()
+        Genre.objects.create(name='Комедия', slug='comedy')
+        assert genre_slugs(APIClient()) == {'drama'}, (
+            'Проверьте, что GET-запрос к `/api/v1/genres/` читает данные '
+            'из реплики'
+        )
+
+    def test_02_nested_lists_read_replica(self, replica, user):
+        title = Title.objects.create(name='Зеркало', year=1975)
+        replica()
+        Review.objects.create(title=title, author=user, text='Отзыв', score=9)
+        response = APIClient().get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 0, (
+            'Проверьте, что список отзывов читается из реплики'
+        )
+
+    def test_03_recent_changes_read_primary(self, replica, settings):
+        settings.REPLICA_LAG_SECONDS = 60
+        Genre.objects.create(name='Драма', slug='drama')
+        replica()
+        Genre.objects.create(name='Комедия', slug='comedy')
+        assert genre_slugs(APIClient()) == {'drama', 'comedy'}, (
+            'Проверьте, что модели, менявшиеся за время отставания реплик, '
+            'читаются из основной базы'
+        )
+
+    def test_04_writes_go_to_primary(self, replica, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert Genre.objects.filter(slug='drama').exists(), (
+            'Проверьте, что записи идут в основную базу'
+        )
+        assert not Genre.objects.using(REPLICA).exists(), (
+            'Проверьте, что записи не идут в реплику'
+        )
+
+    def test_05_write_pins_request_to_primary(self, replica):
+        with replica_routing():
+            assert use_replica() == REPLICA
+            assert router.db_for_read(Genre) == REPLICA
+            Genre.objects.create(name='Драма', slug='drama')
+            assert router.db_for_read(Genre) == 'default', (
+                'Проверьте, что после записи запрос читает из основной базы'
+            )
+            assert Genre.objects.filter(slug='drama').exists(), (
+                'Проверьте, что запрос видит свою запись'
+            )
+            assert use_replica() is None
+
+    def test_06_primary_outside_requests(self, replica):
+        assert router.db_for_read(Genre) == 'default', (
+            'Проверьте, что вне запросов чтение идет из основной базы'
+        )
+        with replica_routing():
+            assert router.db_for_read(Genre) == 'default', (
+                'Проверьте, что без `use_replica` чтение идет из основной '
+                'базы'
+            )
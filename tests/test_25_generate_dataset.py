@@ -0,0 +1,86 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+
+from reviews.models import Comment, Genre, Review, Title, TitleGenre
+from users.models import CustomUser
+
+SCALE = {
+    'users': 20, 'genres': 4, 'categories': 2, 'titles': 30, 'reviews': 200,
+    'comments': 90, 'chunk_size': 50,
+}
+
+
+def generate(**options):
+    call_command('generate_dataset', stdout=StringIO(), **{**SCALE, **options})
+
+
+def snapshot():
+    return (
+        list(Title.objects.order_by('id').values_list()),
+        list(TitleGenre.objects.order_by('title', 'genre').values_list(
+            'title', 'genre')),
+        list(Review.objects.order_by('id').values_list()),
+        list(Comment.objects.order_by('id').values_list()),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25GenerateDataset:
+
+    def test_01_counts(self):
+        generate()
+        assert CustomUser.objects.count() == SCALE['users']
+        assert Genre.objects.count() == SCALE['genres']
+        assert Title.objects.count() == SCALE['titles']
+        assert Review.objects.count() == SCALE['reviews'], (
+            'Проверьте, что команда `generate_dataset` создает заданное '
+            'количество отзывов'
+        )
+        assert Comment.objects.count() == SCALE['comments'], (
+            'Проверьте, что команда `generate_dataset` создает заданное '
+            'количество комментариев'
+        )
+        assert not Title.objects.annotate(
+            genres=Count('genre')).filter(genres=0).exists(), (
+            'Проверьте, что у каждого произведения есть жанр'
+        )
+
+    def test_02_deterministic(self):
+        generate(seed=7)
+        first = snapshot()
+        call_command('flush', interactive=False, verbosity=0)
+        generate(seed=7, chunk_size=1000)
+        assert snapshot() == first, (
+            'Проверьте, что команда `generate_dataset` с одним --seed '
+            'создает одинаковые данные независимо от размера пачки'
+        )
+
+    def test_03_ratings_consistent(self):
+        generate()
+        output = StringIO()
+        call_command('recompute_ratings', stdout=output)
+        assert 'Исправлено: 0.' in output.getvalue(), (
+            'Проверьте, что команда `generate_dataset` сохраняет рейтинги '
+            'произведений, согласованные с отзывами'
+        )
+
+    def test_04_api_reads_generated_data(self, client):
+        generate()
+        title = Title.objects.get(id=1)
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        assert response.json()['count'] == title.review_count, (
+            'Проверьте, что сгенерированные отзывы доступны через API'
+        )
+
+    def test_05_rejects_non_empty_database(self):
+        Genre.objects.create(name='Драма', slug='drama')
+        with pytest.raises(CommandError):
+            generate()
+
+    def test_06_rejects_impossible_scale(self):
+        with pytest.raises(CommandError):
+            generate(users=2, titles=1, reviews=3)
@@ -0,0 +1,75 @@
+import pytest
+from django.urls import URLPattern, URLResolver
+
+from api.v1 import urls
+from tests.query_budgets import QUERY_BUDGETS
+
+LIST_SIZES = (1, 50)
+HTTP_METHODS = ('get', 'post', 'put', 'patch', 'delete')
+
+
+def iter_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def pattern_methods(pattern):
+    callback = pattern.callback
+    if hasattr(callback, 'actions'):
+        allowed = callback.cls.http_method_names
+        return {
+            method for method in callback.actions
+            if method in allowed and method in HTTP_METHODS
+        }
+    view_class = getattr(callback, 'view_class', None)
+    if view_class is None:
+        return {'get'}
+    return {
+        method for method in HTTP_METHODS
+        if method in view_class.http_method_names
+        and hasattr(view_class, method)
+    }
+
+
+def api_endpoints():
+    return {
+        (pattern.name, method)
+        for pattern in iter_patterns(urls.urlpatterns)
+        for method in pattern_methods(pattern)
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26QueryBudgets:
+
+    def test_01_every_endpoint_has_budget(self):
+        budgeted = {(name, method) for name, method, _ in QUERY_BUDGETS}
+        missing = sorted(api_endpoints() - budgeted)
+        assert not missing, (
+            'Добавьте бюджеты запросов в `tests/query_budgets.py` для '
+            f'эндпоинтов: {missing}'
+        )
+
+    @pytest.mark.parametrize(
+        'name,method,role', list(QUERY_BUDGETS),
+        ids=['-'.join(key) for key in QUERY_BUDGETS])
+    def test_02_query_budget(self, replay_endpoint, name, method, role):
+        budget = QUERY_BUDGETS[name, method, role]
+        counts = {
+            size: replay_endpoint(name, method, role, size)
+            for size in LIST_SIZES
+        }
+        for size, count in counts.items():
+            assert count <= budget, (
+                f'{method.upper()}-запрос к `{name}` от роли `{role}` при '
+                f'списках из {size} объектов выполнил {count} SQL-запросов '
+                f'при бюджете {budget}.'
+            )
+        assert counts[LIST_SIZES[-1]] <= counts[LIST_SIZES[0]], (
+            f'Число SQL-запросов {method.upper()}-запроса к `{name}` от роли '
+            f'`{role}` растет с размером списка: {counts}. Проверьте '
+            'загрузку связанных объектов.'
+        )
@@ -0,0 +1,125 @@
+import json
+import logging
+import re
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api.v1.timing import server_timing_middleware
+from tests.fixtures.fixture_query_budget import count_queries
+from tests.utils import create_titles
+
+METRIC_RE = re.compile(
+    r'(?P<name>\w+);dur=(?P<dur>\d+\.\d{3})(?:;desc="(?P<desc>[^"]*)")?')
+
+
+def parse_server_timing(response):
+    assert 'Server-Timing' in response, (
+        'Проверьте, что ответ содержит заголовок Server-Timing'
+    )
+    metrics = {}
+    for item in response['Server-Timing'].split(', '):
+        match = METRIC_RE.fullmatch(item)
+        assert match, (
+            f'Проверьте формат метрики `{item}` заголовка Server-Timing'
+        )
+        metrics[match['name']] = (float(match['dur']), match['desc'])
+    return metrics
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ServerTiming:
+
+    def test_01_phases_in_header(self, client, admin_client):
+        create_titles(admin_client)
+        with count_queries() as counter:
+            response = client.get('/api/v1/titles/')
+        metrics = parse_server_timing(response)
+        for name in ('auth', 'perm', 'query', 'serialize', 'render', 'db',
+                     'total'):
+            assert name in metrics, (
+                f'Проверьте, что заголовок Server-Timing содержит этап '
+                f'`{name}`'
+            )
+        assert metrics['db'][1] == f'{len(counter.queries)} queries', (
+            'Проверьте, что метрика db содержит число SQL-запросов'
+        )
+        phases = sum(
+            duration for name, (duration, _) in metrics.items()
+            if name != 'total')
+        assert phases <= metrics['total'][0] + 0.01, (
+            'Проверьте, что время этапов не учитывается дважды'
+        )
+
+    def test_02_async_views(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/async/titles/')
+        metrics = parse_server_timing(response)
+        duration, desc = metrics['db']
+        assert duration > 0 and desc != '0 queries', (
+            'Проверьте, что для асинхронных представлений учитываются '
+            'SQL-запросы из потоков пула'
+        )
+
+    def test_03_log_line(self, client, admin_client, settings, caplog):
+        create_titles(admin_client)
+        settings.SERVER_TIMING_LOG = True
+        with caplog.at_level(logging.INFO, logger='api.v1.timing'):
+            response = client.get('/api/v1/titles/')
+        records = [
+            json.loads(record.getMessage()) for record in caplog.records
+            if record.name == 'api.v1.timing']
+        assert len(records) == 1, (
+            'Проверьте, что при SERVER_TIMING_LOG на запрос пишется '
+            'одна строка лога'
+        )
+        record = records[0]
+        metrics = parse_server_timing(response)
+        assert record['path'] == '/api/v1/titles/' and (
+            record['status'] == 200), (
+            'Проверьте, что строка лога содержит адрес и статус ответа'
+        )
+        assert f'{record["queries"]} queries' == metrics['db'][1], (
+            'Проверьте, что строка лога содержит число SQL-запросов'
+        )
+        assert set(metrics) <= {
+            name[:-len('_ms')] for name in record if name.endswith('_ms')}, (
+            'Проверьте, что строка лога содержит время всех этапов'
+        )
+
+    def test_04_serialize_phase(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        responses = {
+            'GET /api/v1/titles/{id}/': client.get(
+                f'/api/v1/titles/{titles[0]["id"]}/'),
+            'GET /api/v1/genres/': client.get('/api/v1/genres/'),
+            'POST /api/v1/titles/{id}/reviews/': admin_client.post(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                data={'text': 'Отзыв', 'score': 5}),
+            'GET /api/v1/users/me/': admin_client.get('/api/v1/users/me/'),
+        }
+        for request, response in responses.items():
+            assert response.status_code < 300
+            assert 'serialize' in parse_server_timing(response), (
+                f'Проверьте, что для `{request}` заголовок Server-Timing '
+                'содержит этап `serialize`'
+            )
+
+    def test_05_disabled(self, settings):
+        settings.SERVER_TIMING = False
+
+        def get_response(request):
+            return HttpResponse()
+
+        assert server_timing_middleware(get_response) is get_response, (
+            'Проверьте, что при SERVER_TIMING=False middleware не '
+            'оборачивает обработку запроса'
+        )
+        settings.SERVER_TIMING = True
+        response = server_timing_middleware(get_response)(
+            RequestFactory().get('/'))
+        assert 'db' in response['Server-Timing'], (
+            'Проверьте, что при SERVER_TIMING=True middleware добавляет '
+            'заголовок Server-Timing'
+        )
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from api.v1.metrics import CONTENT_TYPE, LATENCY_BUCKETS, registry
+from tests.fixtures.fixture_query_budget import count_queries
+from tests.utils import create_titles
+
+SAMPLE_RE = re.compile(
+    r'(?P<name>[a-z_]+)(?:\{(?P<labels>[^}]*)\})? (?P<value>\S+)')
+
+
+def parse_metrics(response):
+    assert response['Content-Type'] == CONTENT_TYPE, (
+        'Проверьте, что /metrics отдает текстовый формат Prometheus'
+    )
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if line.startswith('#'):
+            continue
+        match = SAMPLE_RE.fullmatch(line)
+        assert match, f'Проверьте формат строки метрик `{line}`'
+        labels = tuple(
+            re.findall(r'(\w+)="([^"]*)"', match['labels'] or ''))
+        samples[match['name'], labels] = float(match['value'])
+    return samples
+
+
+@pytest.fixture
+def clean_registry():
+    registry.clear()
+    yield registry
+    registry.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Metrics:
+
+    def test_01_route_counters(self, client, admin_client, clean_registry):
+        create_titles(admin_client)
+        clean_registry.clear()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.post('/api/v1/auth/signup/', data={})
+        client.get('/api/v1/missing-route/')
+        samples = parse_metrics(client.get('/metrics'))
+        expected = {
+            ('TitleViewSet.list', 'GET', '200'): 2,
+            ('UserSignupAPI.post', 'POST', '400'): 1,
+            ('unmatched', 'GET', '404'): 1,
+        }
+        for (route, method, status), count in expected.items():
+            key = ('yamdb_http_requests_total', (
+                ('method', method), ('route', route), ('status', status)))
+            assert samples.get(key) == count, (
+                f'Проверьте, что запросы к маршруту `{route}` считаются '
+                'по классу представления и действию'
+            )
+        labels = (('method', 'GET'), ('route', 'TitleViewSet.list'))
+        assert samples[
+            'yamdb_http_request_duration_seconds_count', labels] == 2, (
+            'Проверьте, что гистограмма длительности содержит число запросов'
+        )
+        infinity = samples[
+            'yamdb_http_request_duration_seconds_bucket',
+            labels + (('le', '+Inf'),)]
+        first = samples[
+            'yamdb_http_request_duration_seconds_bucket',
+            labels + (('le', repr(LATENCY_BUCKETS[0])),)]
+        assert first <= infinity == 2, (
+            'Проверьте, что интервалы гистограммы накопительные'
+        )
+        assert samples['yamdb_http_requests_in_progress', ()] == 1, (
+            'Проверьте, что gauge учитывает только запросы в обработке'
+        )
+
+    def test_02_db_queries(self, client, admin_client, clean_registry):
+        create_titles(admin_client)
+        clean_registry.clear()
+        with count_queries() as counter:
+            client.get('/api/v1/titles/')
+        samples = parse_metrics(client.get('/metrics'))
+        labels = (('method', 'GET'), ('route', 'TitleViewSet.list'))
+        assert samples['yamdb_db_queries_total', labels] == len(
+            counter.queries), (
+            'Проверьте, что метрики считают SQL-запросы по маршрутам'
+        )
+        client.get('/api/v1/async/titles/')
+        samples = parse_metrics(client.get('/metrics'))
+        assert samples['yamdb_db_queries_total', (
+            ('method', 'GET'), ('route', 'async_views.title_list'))] > 0, (
+            'Проверьте, что метрики считают SQL-запросы асинхронных '
+            'представлений'
+        )
+
+    def test_03_cache_hits(self, client, admin_client, clean_registry):
+        create_titles(admin_client)
+        clean_registry.clear()
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        samples = parse_metrics(client.get('/metrics'))
+        cache = (('cache', 'response'),)
+        assert samples['yamdb_cache_misses_total', cache] == 1, (
+            'Проверьте, что промахи кэша ответов учитываются в метриках'
+        )
+        assert samples['yamdb_cache_hits_total', cache] == 2, (
+            'Проверьте, что попадания в кэш ответов учитываются в метриках'
+        )
+
+    def test_04_threads(self, clean_registry):
+        labels = (('cache', 'test'),)
+
+        def work():
+            for _ in range(1000):
+                registry.inc('yamdb_cache_hits_total', labels)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert registry.snapshot()[
+            'yamdb_cache_hits_total', labels] == 8000, (
+            'Проверьте, что значения всех потоков суммируются'
+        )
+
+    def test_05_finished_threads(self, clean_registry):
+        labels = (('cache', 'test'),)
+        for _ in range(20):
+            thread = threading.Thread(target=registry.observe, args=(
+                'yamdb_http_request_duration_seconds', labels, 0.02))
+            thread.start()
+            thread.join()
+        assert len(registry.shards) <= threading.active_count() + 1, (
+            'Проверьте, что значения завершившихся потоков переносятся в '
+            'общую сумму процесса и их словари не накапливаются'
+        )
+        buckets = registry.snapshot()[
+            'yamdb_http_request_duration_seconds', labels]
+        assert buckets[LATENCY_BUCKETS.index(0.025)] == 20, (
+            'Проверьте, что значения завершившихся потоков сохраняются'
+        )
+        assert not any(
+            not thread.is_alive() for thread, _ in registry.shards), (
+            'Проверьте, что при выдаче значений словари завершившихся '
+            'потоков удаляются'
+        )
+        registry.clear()
+        assert not registry.snapshot(), (
+            'Проверьте, что сброс обнуляет и значения завершившихся потоков'
+        )
+
+    def test_06_multiprocess(self, client, settings, tmp_path,
+                             clean_registry):
+        settings.METRICS_MULTIPROCESS_DIR = str(tmp_path)
+        finished = subprocess.Popen((sys.executable, '-c', ''))
+        finished.wait()
+        requests = [
+            'yamdb_http_requests_total',
+            [['method', 'GET'], ['route', 'TitleViewSet.list'],
+             ['status', '200']], 5]
+        for pid in (finished.pid, os.getppid()):
+            with open(tmp_path / f'metrics-{pid}.json', 'w') as output:
+                json.dump([
+                    requests, ['yamdb_http_requests_in_progress', [], 2]],
+                    output)
+        client.get('/api/v1/titles/')
+        samples = parse_metrics(client.get('/metrics'))
+        key = ('yamdb_http_requests_total', tuple(map(tuple, requests[1])))
+        assert samples[key] == 11, (
+            'Проверьте, что в режиме нескольких процессов счетчики '
+            'суммируются по файлам всех процессов'
+        )
+        assert samples['yamdb_http_requests_in_progress', ()] == 3, (
+            'Проверьте, что gauge завершенных процессов не учитываются'
+        )
+        assert os.path.exists(tmp_path / f'metrics-{os.getpid()}.json'), (
+            'Проверьте, что процесс сохраняет свои значения в общий каталог'
+        )
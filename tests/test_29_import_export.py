@@ -0,0 +1,240 @@
+import csv
+import os
+import shutil
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.utils.dateparse import parse_datetime
+
+from reviews.management.commands import import_data
+from reviews.management.commands.export_data import EXPORT_FILES
+from reviews.models import Comment, ImportCheckpoint, Review, Title
+
+SUCCESS = 'Импорт данных из CSV файлов завершен.'
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # import_data меняет рабочую директорию, monkeypatch вернет прежнюю.
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'data'
+    shutil.copytree(import_data.DATA_DIRECTORY, path)
+    return path
+
+
+def run_import(path, **options):
+    output = StringIO()
+    call_command('import_data', path=str(path), stdout=output, **options)
+    return output.getvalue()
+
+
+def run_export(path, **options):
+    call_command('export_data', path=str(path), stdout=StringIO(), **options)
+
+
+def append_rows(path, *rows):
+    # Последняя строка файлов с данными не заканчивается переводом строки.
+    with open(path, mode='a', encoding='utf-8', newline='') as file:
+        file.write('\n')
+        csv.writer(file).writerows(rows)
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def snapshot():
+    return {
+        file_name: list(model.objects.order_by('id').values_list(*fields))
+        for file_name, model, _, fields in EXPORT_FILES
+    }
+
+
+def delete_all():
+    for _, model, _, _ in reversed(EXPORT_FILES):
+        model.objects.all().delete()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ImportExport:
+
+    def test_01_stream_resume(self, data_dir, monkeypatch):
+        write_chunk = import_data.Command.write_chunk
+        written = []
+
+        def interrupted_write_chunk(self, spec, *args):
+            if spec[0] == 'review.csv':
+                written.append(spec[0])
+                if len(written) == 3:
+                    raise RuntimeError('импорт прерван')
+            return write_chunk(self, spec, *args)
+
+        monkeypatch.setattr(
+            import_data.Command, 'write_chunk', interrupted_write_chunk)
+        output = run_import(data_dir, stream=True, chunk_size=20)
+        assert 'импорт прерван' in output
+        checkpoint = ImportCheckpoint.objects.get(file_name='review.csv')
+        assert Review.objects.count() == 40, (
+            'Проверьте, что при прерывании потокового импорта сохраняются '
+            'пачки, записанные до прерывания'
+        )
+        assert not Comment.objects.exists()
+
+        monkeypatch.setattr(import_data.Command, 'write_chunk', write_chunk)
+        Review.objects.filter(id=1).delete()
+        output = run_import(data_dir, resume=True, chunk_size=20)
+        assert SUCCESS in output
+        assert (f'review.csv: продолжение с байта {checkpoint.offset}'
+                in output), (
+            'Проверьте, что `import_data --resume` продолжает файл с '
+            'сохраненного смещения'
+        )
+        reviews = read_rows(data_dir / 'review.csv')
+        assert Review.objects.count() == len(reviews) - 1, (
+            'Проверьте, что `import_data --resume` не читает повторно строки '
+            'до контрольной точки и импортирует оставшиеся'
+        )
+        assert not Review.objects.filter(id=1).exists()
+        assert ImportCheckpoint.objects.get(
+            file_name='review.csv').offset == os.path.getsize(
+                data_dir / 'review.csv')
+
+    def test_02_stream_rejected_rows(self, data_dir):
+        append_rows(
+            data_dir / 'review.csv',
+            (1001, 1, 'Оценка вне диапазона', 100, 11,
+             '2020-01-01T00:00:00Z'),
+            (1002, 9999, 'Нет произведения', 100, 5,
+             '2020-01-01T00:00:00Z'))
+        rejects_path = data_dir / 'review.rejected.csv'
+        for _ in range(2):
+            assert SUCCESS in run_import(data_dir, stream=True)
+            rejected = read_rows(rejects_path)
+            assert [row['id'] for row in rejected] == ['1001', '1002'], (
+                'Проверьте, что отклоненные строки записываются в файл '
+                'отклоненных строк, а новый потоковый импорт начинает его '
+                'заново'
+            )
+        assert 'некорректные данные' in rejected[0]['error']
+        assert rejected[1]['error'] == 'связанный объект не найден'
+        assert not Review.objects.filter(id__in=(1001, 1002)).exists()
+        assert not os.path.exists(data_dir / 'comments.rejected.csv')
+
+    def test_03_bulk_skips_unknown_foreign_keys(self, data_dir):
+        append_rows(
+            data_dir / 'review.csv',
+            (1001, 9999, 'Нет произведения', 100, 5,
+             '2020-01-01T00:00:00Z'),
+            (1002, 1, 'Нет автора', 9999, 5, '2020-01-01T00:00:00Z'))
+        output = run_import(data_dir, bulk=True)
+        assert SUCCESS in output
+        reviews = read_rows(data_dir / 'review.csv')
+        assert f'review.csv: добавлено {len(reviews) - 2}, пропущено 2' in (
+            output), (
+            'Проверьте, что `import_data --bulk` пропускает строки со '
+            'ссылками на несуществующие объекты'
+        )
+        assert Review.objects.count() == len(reviews) - 2
+        assert not os.path.exists(data_dir / 'review.rejected.csv')
+
+    def test_04_workers_dependency_order(self, data_dir, monkeypatch):
+        write_chunk = import_data.Command.write_chunk
+        written = []
+
+        def recording_write_chunk(self, spec, *args):
+            written.append(spec[0])
+            return write_chunk(self, spec, *args)
+
+        monkeypatch.setattr(
+            import_data.Command, 'write_chunk', recording_write_chunk)
+        assert SUCCESS in run_import(data_dir, workers=2, chunk_size=5)
+        dependencies = import_data.build_dependencies(import_data.IMPORT_FILES)
+        for position, file_name in enumerate(written):
+            assert not dependencies[file_name] & set(written[position:]), (
+                'Проверьте, что при `import_data --workers` пачки файла '
+                'записываются после всех пачек файлов, от которых он зависит'
+            )
+        assert Review.objects.count() == len(
+            read_rows(data_dir / 'review.csv'))
+        assert Comment.objects.count() == len(
+            read_rows(data_dir / 'comments.csv'))
+
+    def test_05_export_round_trip(self, data_dir, tmp_path):
+        assert SUCCESS in run_import(data_dir, bulk=True)
+        pub_date = read_rows(data_dir / 'review.csv')[0]['pub_date']
+        assert Review.objects.get(id=1).pub_date == parse_datetime(
+            pub_date), (
+            'Проверьте, что импорт сохраняет даты публикации из файла'
+        )
+        imported = snapshot()
+        run_export(tmp_path / 'export')
+        delete_all()
+        assert SUCCESS in run_import(tmp_path / 'export', bulk=True)
+        assert snapshot() == imported, (
+            'Проверьте, что данные, выгруженные `export_data`, '
+            'загружаются `import_data` без изменений'
+        )
+        assert Title.objects.get(id=1).rating is not None
+
+    def test_06_export_since_id(self, data_dir, tmp_path):
+        assert SUCCESS in run_import(data_dir, bulk=True)
+        imported = snapshot()
+        export_path = tmp_path / 'export'
+        run_export(export_path, since_id=30)
+        for file_name, model, _, _ in EXPORT_FILES:
+            ids = [
+                int(row['id'])
+                for row in read_rows(export_path / f'{file_name}.csv')]
+            assert ids == list(model.objects.filter(id__gt=30).order_by(
+                'id').values_list('id', flat=True)), (
+                'Проверьте, что `export_data --since-id` выгружает только '
+                'объекты с большим id'
+            )
+        Review.objects.filter(id__gt=30).delete()
+        assert SUCCESS in run_import(export_path, bulk=True)
+        assert snapshot() == imported, (
+            'Проверьте, что инкрементальная выгрузка восстанавливает '
+            'объекты через `import_data`'
+        )
+
+    def test_07_export_since(self, data_dir, tmp_path):
+        assert SUCCESS in run_import(data_dir, bulk=True)
+        imported = snapshot()
+        export_path = tmp_path / 'export'
+        run_export(export_path, since='2020-01-01')
+        assert not read_rows(export_path / 'review.csv')
+        assert len(read_rows(export_path / 'comments.csv')) == (
+            Comment.objects.filter(pub_date__gte='2020-01-01').count()), (
+            'Проверьте, что `export_data --since` выгружает отзывы и '
+            'комментарии, опубликованные начиная с указанной даты'
+        )
+        assert len(read_rows(export_path / 'titles.csv')) == (
+            Title.objects.count())
+        Comment.objects.all().delete()
+        assert SUCCESS in run_import(export_path, bulk=True)
+        assert snapshot() == imported
+
+    def test_08_aborted_import_ratings(self, data_dir):
+        first = read_rows(data_dir / 'review.csv')[0]
+        append_rows(
+            data_dir / 'review.csv',
+            (1001, first['title_id'], 'Повторный отзыв', first['author'], 5,
+             '2020-01-01T00:00:00Z'))
+        output = run_import(data_dir, bulk=True, chunk_size=20)
+        assert 'UNIQUE constraint failed' in output
+        assert Review.objects.count() == 60
+        totals = {
+            row['title_id']: (row['score_sum'], row['review_count'])
+            for row in Review.objects.values('title_id').annotate(
+                score_sum=Sum('score'), review_count=Count('id')).order_by()
+        }
+        for title in Title.objects.all():
+            assert (title.score_sum, title.review_count) == totals.get(
+                title.id, (0, 0)), (
+                'Проверьте, что при прерывании импорта рейтинги произведений '
+                'согласованы с записанными отзывами'
+            )
+        Review.objects.filter(id=first['id']).delete()